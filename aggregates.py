@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+# Dimensions of the materialized cube shared by the /api/* endpoints
+CUBE_KEYS = ["category", "level", "joker_used", "correct_answer", "contestant_answer"]
+
+# Answer encoding used by answer_tensor(); anything else is OTHER or MISSING
+CHOICES = ["A", "B", "C", "D"]
+OTHER_ANSWER = len(CHOICES)  # Non-empty answer outside A-D (e.g. "çekildi")
+MISSING_ANSWER = OTHER_ANSWER + 1  # No answer recorded
+ANSWER_CODES = MISSING_ANSWER + 1
+
+
+def encode_answers(values):
+    """Map answer labels to CHOICES positions, OTHER_ANSWER or MISSING_ANSWER"""
+    values = pd.Series(values)
+    codes = values.map({choice: i for i, choice in enumerate(CHOICES)})
+    codes = codes.fillna(OTHER_ANSWER).mask(values.isna(), MISSING_ANSWER)
+    return codes.to_numpy(dtype=np.intp)
+
+
+class AggregateStore:
+    """Pre-aggregated view of the dataset, built once per dataset version"""
+
+    def __init__(self, df):
+        # Keep the order of first appearance so endpoint output matches df.unique()
+        self.categories = df["category"].unique().tolist()
+        self.jokers = df["joker_used"].unique().tolist()
+        self.levels = sorted(df["level"].unique())
+
+        self.cube = (
+            df.groupby(CUBE_KEYS, dropna=False, sort=False)
+            .agg(
+                questions=("level", "size"),
+                correct=("is_correct", "sum"),
+                eliminated=("eliminated", "sum"),
+            )
+            .reset_index()
+        )
+        self.cube["level_sum"] = self.cube["level"] * self.cube["questions"]
+        self._correct_codes = encode_answers(self.cube["correct_answer"])
+        self._answer_codes = encode_answers(self.cube["contestant_answer"])
+
+        # Figures that need per-row or per-contestant information
+        contestant_final_levels = df.groupby("contestant")["level"].max()
+        self.total_questions = int(len(df))
+        self.total_contestants = int(df["contestant"].nunique())
+        self.total_videos = int(df["video_id"].nunique())
+        self.average_final_level = float(contestant_final_levels.mean())
+        self.level_amounts = (
+            df.drop_duplicates("level").set_index("level")["amount"].to_dict()
+        )
+
+        self._rollups = {}
+
+    def rollup(self, *keys):
+        """Sum the cube over every dimension except ``keys`` (memoized)"""
+        if keys not in self._rollups:
+            columns = ["questions", "correct", "eliminated", "level_sum"]
+            if keys:
+                table = self.cube.groupby(list(keys), dropna=False, sort=False)[
+                    columns
+                ].sum()
+            else:
+                table = self.cube[columns].sum().to_frame().T
+            self._rollups[keys] = table
+        return self._rollups[keys]
+
+    def value_counts(self, key):
+        """Like df[key].value_counts(): non-null labels, most frequent first"""
+        counts = self.rollup(key)["questions"]
+        counts = counts[counts.index.notna()]
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def crosstab(self, index, columns, value="questions"):
+        """Two-dimensional table of one counter, zero-filled (memoized)"""
+        key = ("crosstab", index, columns, value)
+        if key not in self._rollups:
+            self._rollups[key] = self.rollup(index, columns)[value].unstack(
+                columns, fill_value=0
+            )
+        return self._rollups[key]
+
+    def answer_tensor(self, key=None, value="questions"):
+        """Counts shaped (slice, correct_answer, contestant_answer) (memoized)
+
+        Returns ``(labels, tensor)`` where ``tensor[i]`` holds the counts for
+        ``labels[i]`` of ``key`` and both answer axes use the encode_answers()
+        codes. Without a key there is a single slice labelled None.
+        """
+        cache_key = ("answer_tensor", key, value)
+        if cache_key not in self._rollups:
+            if key is None:
+                slice_codes = np.zeros(len(self.cube), dtype=np.intp)
+                labels = [None]
+            else:
+                slice_codes, labels = pd.factorize(
+                    self.cube[key], use_na_sentinel=False
+                )
+                labels = labels.tolist()
+
+            tensor = np.zeros((len(labels), ANSWER_CODES, ANSWER_CODES), dtype=np.int64)
+            np.add.at(
+                tensor,
+                (slice_codes, self._correct_codes, self._answer_codes),
+                self.cube[value].to_numpy(dtype=np.int64),
+            )
+            self._rollups[cache_key] = (labels, tensor)
+        return self._rollups[cache_key]
+
+    def totals(self):
+        """Dataset-wide counters as a plain dict"""
+        row = self.rollup().iloc[0]
+        return {column: int(value) for column, value in row.items()}
+
+    def level_range(self, low=None, high=None, category=None):
+        """Counters for ``low <= level < high``, optionally within one category"""
+        if category is None:
+            table = self.rollup("level")
+        else:
+            table = self.rollup("category", "level")
+            if category not in table.index.get_level_values(0):
+                return {"questions": 0, "correct": 0, "eliminated": 0}
+            table = table.loc[category]
+
+        levels = table.index.to_numpy()
+        mask = np.ones(len(levels), dtype=bool)
+        if low is not None:
+            mask &= levels >= low
+        if high is not None:
+            mask &= levels < high
+        selected = table[mask]
+        return {
+            "questions": int(selected["questions"].sum()),
+            "correct": int(selected["correct"].sum()),
+            "eliminated": int(selected["eliminated"].sum()),
+        }
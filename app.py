@@ -1,16 +1,322 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request, g
 import pandas as pd
+import hashlib
+import io
 import json
-from collections import Counter, defaultdict
+import os
+import pickle
+import threading
+import zlib
+from contextlib import suppress
+from glob import glob
+from collections import Counter, defaultdict, namedtuple
 import numpy as np
 
+from aggregates import CHOICES, MISSING_ANSWER, AggregateStore
+from data_index import EQUALITY_FILTERS, DataIndex
+
 app = Flask(__name__)
 
+DATA_PATH = "csv/milyoner_data_final.csv"
+PATTERN_REPORT_PATH = "pattern_analysis_report.json"
+
+# Keep serialized pattern reports on disk next to PATTERN_REPORT_PATH
+app.config.setdefault("PATTERN_REPORT_DISK_CACHE", True)
+
+# Worker processes for pattern mining, 1 to count in the web process itself
+app.config.setdefault("PATTERN_ANALYSIS_WORKERS", 1)
+
+# Seconds browsers and proxies may reuse an /api/* response without revalidating
+app.config.setdefault("API_CACHE_MAX_AGE", 60)
+
+# Bump when the shape of any /api/* response changes so cached copies are dropped
+API_CACHE_VERSION = 3
+
+# Largest page /api/data serves when a limit is given
+MAX_PAGE_SIZE = 1000
+
+# Rows serialized per chunk when /api/data streams NDJSON or CSV
+STREAM_CHUNK_ROWS = 1000
+
+# Endpoints whose responses change without the dataset changing
+UNCACHED_ENDPOINTS = {"get_cache_stats"}
+
+DatasetSnapshot = namedtuple("DatasetSnapshot", ["df", "version", "fingerprint"])
+
+
+class DatasetCache:
+    """Keep the parsed dataset in memory and reload it only when the CSV changes"""
+
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.df = None
+        self.signature = None
+        self.fingerprint = None
+        self.version = 0
+        self.counters = {"hits": 0, "misses": 0, "reloads": 0}
+        self._lock = threading.Lock()
+        self._derived = {}
+        # One lock per derived value, so a slow build (the pattern report)
+        # does not hold up the others; see _derived_lock_for()
+        self._derived_locks = {}
+
+    def _file_signature(self):
+        """Identify the current file contents by modification time and size"""
+        stat = os.stat(self.csv_file)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self):
+        return self.snapshot().df
+
+    def snapshot(self):
+        """Return the current frame with its version number and content hash"""
+        signature = self._file_signature()
+
+        with self._lock:
+            if self.df is not None and signature == self.signature:
+                self.counters["hits"] += 1
+                return DatasetSnapshot(self.df, self.version, self.fingerprint)
+
+            if self.df is None:
+                self.counters["misses"] += 1
+            else:
+                self.counters["reloads"] += 1
+
+            # Hash and parse the same bytes so the fingerprint always matches df
+            with open(self.csv_file, "rb") as f:
+                content = f.read()
+            self.df = pd.read_csv(io.BytesIO(content))
+            self.fingerprint = hashlib.sha256(content).hexdigest()
+            self.signature = signature
+            self.version += 1
+            return DatasetSnapshot(self.df, self.version, self.fingerprint)
+
+    def _derived_lock_for(self, name):
+        with self._lock:
+            return self._derived_locks.setdefault(name, threading.Lock())
+
+    def derived(self, name, build):
+        """Return build(snapshot) for the current dataset, rebuilt once per version
+
+        Cache hits take no lock. A miss locks only ``name``, so concurrent
+        requests for the same value wait for one build while other derived
+        values stay available. ``build`` may depend on other derived values.
+        """
+        snapshot = self.snapshot()
+
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+
+        with self._derived_lock_for(name):
+            # Another thread may have built it while we waited for the lock
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == snapshot.version:
+                return cached[1]
+
+            value = build(snapshot)
+            self._derived[name] = (snapshot.version, value)
+            return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "csv_file": self.csv_file,
+                "version": self.version,
+                "fingerprint": self.fingerprint,
+                "loaded": self.df is not None,
+                "rows": int(len(self.df)) if self.df is not None else 0,
+                **self.counters,
+            }
+
+
+dataset_cache = DatasetCache(DATA_PATH)
+
 
 # Load the data
 def load_data():
-    df = pd.read_csv("csv/milyoner_data_final.csv")
-    return df
+    # The cached frame is shared between requests, so routes must not modify it
+    return dataset_cache.get()
+
+
+def load_aggregates():
+    return dataset_cache.derived(
+        "aggregates", lambda snapshot: AggregateStore(snapshot.df)
+    )
+
+
+def load_data_index():
+    return dataset_cache.derived("data_index", lambda snapshot: DataIndex(snapshot.df))
+
+
+# Convert complex data structures for JSON serialization
+def convert_counters(obj):
+    if isinstance(obj, Counter):
+        return dict(obj)
+    elif isinstance(obj, defaultdict):
+        return dict(obj)
+    elif isinstance(obj, dict):
+        return {k: convert_counters(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_counters(item) for item in obj]
+    return obj
+
+
+# The analyzer memoizes report sections lazily and is not safe to share unguarded
+pattern_analyzer_lock = threading.Lock()
+
+
+def pattern_report_cache_file(fingerprint):
+    # The API version is part of the name so a report shape change is not reused
+    base, ext = os.path.splitext(PATTERN_REPORT_PATH)
+    return f"{base}.v{API_CACHE_VERSION}-{fingerprint[:16]}{ext}"
+
+
+def pattern_state_file(fingerprint):
+    base, _ = os.path.splitext(PATTERN_REPORT_PATH)
+    return f"{base}.v{API_CACHE_VERSION}-{fingerprint[:16]}.pkl"
+
+
+def build_pattern_analyzer(snapshot):
+    # Import lazily so the dashboard endpoints do not pay for it at startup
+    from pattern_analysis import ContestantPatternAnalyzer
+
+    workers = app.config["PATTERN_ANALYSIS_WORKERS"]
+    use_disk = app.config["PATTERN_REPORT_DISK_CACHE"]
+    state_file = pattern_state_file(snapshot.fingerprint)
+
+    # The saved state carries the reliability index, so predictions after a
+    # restart do not rebuild the analyzer and its n-gram index
+    if use_disk and os.path.exists(state_file):
+        try:
+            return ContestantPatternAnalyzer.load_state(state_file, workers)
+        except (
+            ValueError,
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            ModuleNotFoundError,
+        ):
+            pass  # Written by another analyzer version; rebuild it below
+
+    analyzer = ContestantPatternAnalyzer(snapshot.df, workers=workers)
+    if use_disk:
+        base, _ = os.path.splitext(PATTERN_REPORT_PATH)
+        for stale in glob(f"{base}.*.pkl"):
+            if stale != state_file:
+                # Another worker may be clearing the same files
+                with suppress(FileNotFoundError):
+                    os.remove(stale)
+        analyzer.save_state(state_file)
+    return analyzer
+
+
+def load_pattern_analyzer():
+    return dataset_cache.derived("pattern_analyzer", build_pattern_analyzer)
+
+
+def load_reliability_index():
+    # Built once per dataset version; lookups only read it, so they need no lock
+    def build(snapshot):
+        analyzer = load_pattern_analyzer()
+        with pattern_analyzer_lock:
+            return analyzer.reliability_index
+
+    return dataset_cache.derived("reliability_index", build)
+
+
+def build_pattern_report(snapshot):
+    """Serialized /api/pattern_analysis body for one dataset version"""
+    use_disk = app.config["PATTERN_REPORT_DISK_CACHE"]
+    cache_file = pattern_report_cache_file(snapshot.fingerprint)
+
+    if use_disk and os.path.exists(cache_file):
+        with open(cache_file, "rb") as f:
+            return f.read()
+
+    with pattern_analyzer_lock:
+        report = load_pattern_analyzer().generate_comprehensive_report()
+
+    # Clean the report for JSON serialization
+    body = jsonify(convert_counters(report)).get_data()
+
+    if use_disk:
+        # Write atomically and drop reports of older dataset versions
+        base, ext = os.path.splitext(PATTERN_REPORT_PATH)
+        for stale in glob(f"{base}.*{ext}"):
+            if stale != cache_file:
+                with suppress(FileNotFoundError):
+                    os.remove(stale)
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(body)
+        os.replace(tmp_file, cache_file)
+
+    return body
+
+
+def build_pattern_sections(snapshot, sections):
+    """Serialized /api/pattern_analysis body holding only ``sections``"""
+    cache_file = pattern_report_cache_file(snapshot.fingerprint)
+
+    if app.config["PATTERN_REPORT_DISK_CACHE"] and os.path.exists(cache_file):
+        # Slice the full report on disk instead of recomputing after a restart.
+        # Dumped unsorted in jsonify's compact format: keys keep the order they
+        # were written in (integer keys sorted numerically), so the body is
+        # the same as a freshly computed one
+        with open(cache_file, "rb") as f:
+            report = json.load(f)
+        subset = {name: value for name, value in report.items() if name in sections}
+        return (json.dumps(subset, separators=(",", ":")) + "\n").encode()
+
+    with pattern_analyzer_lock:
+        report = load_pattern_analyzer().generate_comprehensive_report(sections)
+    return jsonify(convert_counters(report)).get_data()
+
+
+def is_cacheable_request():
+    return (
+        request.method in ("GET", "HEAD")
+        and request.path.startswith("/api/")
+        and request.endpoint is not None
+        and request.endpoint not in UNCACHED_ENDPOINTS
+    )
+
+
+def dataset_etag():
+    """ETag shared by all /api/* responses of the current dataset version"""
+    fingerprint = dataset_cache.snapshot().fingerprint
+    return f"v{API_CACHE_VERSION}-{fingerprint[:32]}"
+
+
+def apply_cache_headers(response, etag):
+    # Weak: the same tag covers the gzip and plain encodings of a response
+    response.set_etag(etag, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config["API_CACHE_MAX_AGE"]
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@app.before_request
+def answer_conditional_get():
+    # Answer If-None-Match before the view runs so a 304 costs no recomputation
+    if not is_cacheable_request():
+        return None
+
+    g.etag = dataset_etag()
+    # If-None-Match uses weak comparison, so W/ tags from proxies still match
+    if request.if_none_match.contains_weak(g.etag):
+        return apply_cache_headers(app.response_class(status=304), g.etag)
+    return None
+
+
+@app.after_request
+def add_cache_headers(response):
+    etag = g.get("etag")
+    if etag is not None and response.status_code == 200:
+        apply_cache_headers(response, etag)
+    return response
 
 
 @app.route("/")
@@ -18,117 +324,271 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/api/cache_stats")
+def get_cache_stats():
+    return jsonify({"dataset": dataset_cache.stats()})
+
+
+def parse_bool(value):
+    if value.lower() in ("true", "1", "yes"):
+        return True
+    if value.lower() in ("false", "0", "no"):
+        return False
+    raise ValueError(f"invalid boolean: {value}")
+
+
+def parse_data_query(args, columns, max_limit=MAX_PAGE_SIZE):
+    """Validate /api/data query parameters into DataIndex.query() arguments"""
+    filters = {}
+    for column in EQUALITY_FILTERS:
+        values = args.getlist(column)
+        if values:
+            if column == "is_correct":
+                values = [parse_bool(value) for value in values]
+            filters[column] = values
+
+    query = {
+        "filters": filters,
+        "level_min": args.get("level_min", type=int),
+        "level_max": args.get("level_max", type=int),
+    }
+    for name in ("level_min", "level_max"):
+        if name in args and query[name] is None:
+            raise ValueError(f"{name} must be an integer")
+
+    sort = args.get("sort")
+    if sort:
+        descending = sort.startswith("-")
+        sort = sort.lstrip("-")
+        if sort not in columns:
+            raise ValueError(f"unknown sort column: {sort}")
+        query["sort"] = sort
+        query["descending"] = descending
+
+    fields = args.get("fields")
+    if fields:
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    else:
+        fields = None
+
+    offset = args.get("offset", type=int)
+    limit = args.get("limit", type=int)
+    if "offset" in args and (offset is None or offset < 0):
+        raise ValueError("offset must be a non-negative integer")
+    if "limit" in args and (limit is None or limit <= 0):
+        raise ValueError("limit must be a positive integer")
+    if max_limit is not None and limit is not None and limit > max_limit:
+        raise ValueError(f"limit must be between 1 and {max_limit}")
+
+    return query, fields, offset or 0, limit
+
+
+def ndjson_chunks(frames):
+    for frame in frames:
+        yield frame.to_json(orient="records", lines=True, force_ascii=False)
+
+
+def csv_chunks(frames, columns):
+    header = True
+    for frame in frames:
+        yield frame.to_csv(index=False, header=header)
+        header = False
+    if header:
+        # No matching rows: still send the header line
+        yield ",".join(columns) + "\n"
+
+
+def encode_stream(chunks, use_gzip):
+    """UTF-8 encode text chunks, gzip-compressing them incrementally if asked"""
+    if not use_gzip:
+        for chunk in chunks:
+            yield chunk.encode("utf-8")
+        return
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_data(index, rows, offset, limit, fields, data_format):
+    """Stream /api/data rows chunk by chunk so memory stays flat"""
+    frames = index.iter_frames(rows, offset, limit, fields, STREAM_CHUNK_ROWS)
+    if data_format == "ndjson":
+        chunks = ndjson_chunks(frames)
+        mimetype = "application/x-ndjson"
+    else:
+        chunks = csv_chunks(frames, fields or index.columns)
+        mimetype = "text/csv"
+
+    use_gzip = "gzip" in request.accept_encodings
+    response = app.response_class(encode_stream(chunks, use_gzip), mimetype=mimetype)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    if data_format == "csv":
+        response.headers["Content-Disposition"] = (
+            "attachment; filename=milyoner_data.csv"
+        )
+    return response
+
+
 @app.route("/api/data")
 def get_data():
-    df = load_data()
+    """Dataset rows, optionally filtered, sorted, projected and paginated
+
+    Filters: video_id, contestant, category, joker_used, is_correct (repeat a
+    parameter to accept several values) and level_min/level_max. Sorting:
+    sort=<column> or sort=-<column>. Projection: fields=a,b,c. Without a
+    limit the response stays a plain list of every matching row; with one it
+    is a page object with the total and the next offset.
+
+    format=ndjson or format=csv streams the matching rows instead (no page
+    size cap), gzip-compressed when the client accepts it.
+    """
+    index = load_data_index()
+    data_format = request.args.get("format", "json")
+    if data_format not in ("json", "ndjson", "csv"):
+        return jsonify({"error": f"unknown format: {data_format}"}), 400
+
+    try:
+        query, fields, offset, limit = parse_data_query(
+            request.args,
+            index.columns,
+            max_limit=MAX_PAGE_SIZE if data_format == "json" else None,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Convert DataFrame to JSON
-    data = df.to_dict("records")
-    return jsonify(data)
+    rows = index.query(**query)
+    if data_format != "json":
+        return stream_data(index, rows, offset, limit, fields, data_format)
 
+    data = index.page(rows, offset, limit, fields)
+    if limit is None:
+        return jsonify(data)
 
-@app.route("/api/stats")
-def get_stats():
-    df = load_data()
+    total = len(index.df) if rows is None else len(rows)
+    return jsonify(
+        {
+            "rows": data,
+            "total": int(total),
+            "offset": offset,
+            "limit": limit,
+            "next_offset": offset + limit if offset + limit < total else None,
+        }
+    )
 
-    # Basic overview statistics
-    # Calculate average final level reached by contestants (not average level of all questions)
-    contestant_final_levels = df.groupby("contestant")["level"].max()
 
+def stats_payload(store):
+    totals = store.totals()
+
+    # Basic overview statistics
+    # Average final level is taken per contestant (not the average level of all questions)
     stats = {
-        "total_questions": int(len(df)),
-        "total_contestants": int(df["contestant"].nunique()),
-        "total_videos": int(df["video_id"].nunique()),
-        "overall_accuracy": float((df["is_correct"].sum() / len(df)) * 100),
-        "total_eliminated": int(df["eliminated"].sum()),
-        "average_level": float(contestant_final_levels.mean()),
+        "total_questions": store.total_questions,
+        "total_contestants": store.total_contestants,
+        "total_videos": store.total_videos,
+        "overall_accuracy": float((totals["correct"] / totals["questions"]) * 100),
+        "total_eliminated": totals["eliminated"],
+        "average_level": store.average_final_level,
     }
 
-    return jsonify(stats)
+    return stats
 
 
-@app.route("/api/category_stats")
-def get_category_stats():
-    df = load_data()
+@app.route("/api/stats")
+def get_stats():
+    return jsonify(stats_payload(load_aggregates()))
 
-    # Detailed category analysis
-    category_stats = []
-    for category in df["category"].unique():
-        cat_data = df[df["category"] == category]
 
-        # Level distribution for this category
-        level_distribution = {}
-        for level in range(1, 16):
-            level_questions = cat_data[cat_data["level"] == level]
-            level_distribution[f"level_{level}"] = int(len(level_questions))
+def category_stats_payload(store):
+    by_category = store.rollup("category")
+
+    # Category x level tables, one row per category
+    questions = store.crosstab("category", "level", "questions")
+    correct = store.crosstab("category", "level", "correct")
+    before_7 = questions.columns < 7
+    before_questions = questions.loc[:, before_7].sum(axis=1)
+    before_correct = correct.loc[:, before_7].sum(axis=1)
+    after_questions = questions.loc[:, ~before_7].sum(axis=1)
+    after_correct = correct.loc[:, ~before_7].sum(axis=1)
+    level_distribution = questions.reindex(columns=range(1, 16), fill_value=0)
 
-        # Before level 7 vs after level 7
-        before_level_7 = cat_data[cat_data["level"] < 7]
-        level_7_and_after = cat_data[cat_data["level"] >= 7]
+    # Detailed category analysis
+    category_stats = []
+    for category in store.categories:
+        row = by_category.loc[category]
+        before_total = int(before_questions[category])
+        after_total = int(after_questions[category])
 
         category_stats.append(
             {
                 "category": str(category),
-                "total_questions": int(len(cat_data)),
-                "accuracy": float((cat_data["is_correct"].sum() / len(cat_data)) * 100),
-                "average_level": float(cat_data["level"].mean()),
-                "before_level_7": int(len(before_level_7)),
-                "level_7_and_after": int(len(level_7_and_after)),
+                "total_questions": int(row["questions"]),
+                "accuracy": float((row["correct"] / row["questions"]) * 100),
+                "average_level": float(row["level_sum"] / row["questions"]),
+                "before_level_7": before_total,
+                "level_7_and_after": after_total,
                 "before_level_7_accuracy": (
-                    float(
-                        (before_level_7["is_correct"].sum() / len(before_level_7)) * 100
-                    )
-                    if len(before_level_7) > 0
+                    float((before_correct[category] / before_total) * 100)
+                    if before_total > 0
                     else 0
                 ),
                 "level_7_and_after_accuracy": (
-                    float(
-                        (level_7_and_after["is_correct"].sum() / len(level_7_and_after))
-                        * 100
-                    )
-                    if len(level_7_and_after) > 0
+                    float((after_correct[category] / after_total) * 100)
+                    if after_total > 0
                     else 0
                 ),
-                "level_distribution": level_distribution,
+                "level_distribution": {
+                    f"level_{level}": int(count)
+                    for level, count in level_distribution.loc[category].items()
+                },
             }
         )
 
-    return jsonify(category_stats)
+    return category_stats
 
 
-@app.route("/api/level_stats")
-def get_level_stats():
-    df = load_data()
+@app.route("/api/category_stats")
+def get_category_stats():
+    return jsonify(category_stats_payload(load_aggregates()))
+
+
+def level_stats_payload(store):
+    by_level = store.rollup("level")
+
+    # Level x category question counts, categories in order of appearance
+    category_counts = store.crosstab("level", "category").reindex(
+        columns=store.categories, fill_value=0
+    )
 
     # Detailed level analysis
     level_stats = []
-    for level in sorted(df["level"].unique()):
-        level_data = df[df["level"] == level]
+    for level in store.levels:
+        row = by_level.loc[level]
+        total = int(row["questions"])
+        eliminated = int(row["eliminated"])
 
         # Category distribution for this level
-        category_distribution = {}
-        for category in df["category"].unique():
-            cat_questions = level_data[level_data["category"] == category]
-            category_distribution[category] = int(len(cat_questions))
-
-        # Elimination analysis
-        eliminated_at_level = level_data[level_data["eliminated"] == True]
+        category_distribution = {
+            category: int(count)
+            for category, count in category_counts.loc[level].items()
+        }
 
         level_stats.append(
             {
                 "level": int(level),
-                "total_questions": int(len(level_data)),
-                "accuracy": float(
-                    (level_data["is_correct"].sum() / len(level_data)) * 100
-                ),
-                "amount": float(
-                    level_data["amount"].iloc[0] if len(level_data) > 0 else 0
-                ),
-                "eliminated_count": int(len(eliminated_at_level)),
+                "total_questions": total,
+                "accuracy": float((row["correct"] / total) * 100),
+                "amount": float(store.level_amounts.get(level, 0)),
+                "eliminated_count": eliminated,
                 "elimination_rate": (
-                    float((len(eliminated_at_level) / len(level_data)) * 100)
-                    if len(level_data) > 0
-                    else 0
+                    float((eliminated / total) * 100) if total > 0 else 0
                 ),
                 "category_distribution": category_distribution,
                 "most_common_category": (
@@ -139,33 +599,39 @@ def get_level_stats():
             }
         )
 
-    return jsonify(level_stats)
+    return level_stats
 
 
-@app.route("/api/joker_stats")
-def get_joker_stats():
-    df = load_data()
+@app.route("/api/level_stats")
+def get_level_stats():
+    return jsonify(level_stats_payload(load_aggregates()))
 
-    # Joker usage statistics
-    joker_counts = df["joker_used"].value_counts().to_dict()
+
+def joker_stats_payload(store):
+    by_joker = store.rollup("joker_used")
 
     # Accuracy with and without jokers
     joker_accuracy = []
-    for joker in df["joker_used"].unique():
-        joker_data = df[df["joker_used"] == joker]
+    for joker in store.jokers:
+        row = by_joker.loc[joker]
         joker_accuracy.append(
             {
                 "joker": str(joker),
-                "count": int(len(joker_data)),
+                "count": int(row["questions"]),
                 "accuracy": float(
-                    (joker_data["is_correct"].sum() / len(joker_data)) * 100
-                    if len(joker_data) > 0
+                    (row["correct"] / row["questions"]) * 100
+                    if row["questions"] > 0
                     else 0
                 ),
             }
         )
 
-    return jsonify(joker_accuracy)
+    return joker_accuracy
+
+
+@app.route("/api/joker_stats")
+def get_joker_stats():
+    return jsonify(joker_stats_payload(load_aggregates()))
 
 
 @app.route("/api/contestant_performance")
@@ -208,26 +674,24 @@ def get_contestant_performance():
     return jsonify(contestant_stats)
 
 
-@app.route("/api/answer_choice_stats")
-def get_answer_choice_stats():
-    df = load_data()
+def answer_choice_stats_payload(store):
+    total = store.total_questions
+    by_correct_answer = store.rollup("correct_answer")
 
     # Answer choice distribution analysis
-    correct_answer_dist = df["correct_answer"].value_counts().to_dict()
-    contestant_answer_dist = df["contestant_answer"].value_counts().to_dict()
+    correct_answer_dist = store.value_counts("correct_answer").to_dict()
+    contestant_answer_dist = store.value_counts("contestant_answer").to_dict()
 
     # Accuracy by answer choice
     choice_accuracy = {}
-    for choice in ["A", "B", "C", "D"]:
-        choice_data = df[df["correct_answer"] == choice]
-        if len(choice_data) > 0:
+    for choice in CHOICES:
+        if choice in by_correct_answer.index:
+            row = by_correct_answer.loc[choice]
             choice_accuracy[choice] = {
-                "total_questions": int(len(choice_data)),
-                "accuracy": float(
-                    (choice_data["is_correct"].sum() / len(choice_data)) * 100
-                ),
-                "times_correct": int(choice_data["is_correct"].sum()),
-                "times_chosen": int(len(df[df["contestant_answer"] == choice])),
+                "total_questions": int(row["questions"]),
+                "accuracy": float((row["correct"] / row["questions"]) * 100),
+                "times_correct": int(row["correct"]),
+                "times_chosen": int(contestant_answer_dist.get(choice, 0)),
             }
 
     # Most selected vs most correct
@@ -242,52 +706,50 @@ def get_answer_choice_stats():
         else ("", 0)
     )
 
-    return jsonify(
-        {
-            "correct_answer_distribution": {
-                k: int(v) for k, v in correct_answer_dist.items()
-            },
-            "contestant_answer_distribution": {
-                k: int(v) for k, v in contestant_answer_dist.items()
-            },
-            "choice_accuracy": choice_accuracy,
-            "most_selected_choice": {
-                "choice": most_selected[0],
-                "count": int(most_selected[1]),
-            },
-            "most_correct_choice": {
-                "choice": most_correct[0],
-                "count": int(most_correct[1]),
-            },
-            "bias_analysis": {
-                "a_bias": float((contestant_answer_dist.get("A", 0) / len(df)) * 100),
-                "b_bias": float((contestant_answer_dist.get("B", 0) / len(df)) * 100),
-                "c_bias": float((contestant_answer_dist.get("C", 0) / len(df)) * 100),
-                "d_bias": float((contestant_answer_dist.get("D", 0) / len(df)) * 100),
-            },
-        }
-    )
+    return {
+        "correct_answer_distribution": {
+            k: int(v) for k, v in correct_answer_dist.items()
+        },
+        "contestant_answer_distribution": {
+            k: int(v) for k, v in contestant_answer_dist.items()
+        },
+        "choice_accuracy": choice_accuracy,
+        "most_selected_choice": {
+            "choice": most_selected[0],
+            "count": int(most_selected[1]),
+        },
+        "most_correct_choice": {
+            "choice": most_correct[0],
+            "count": int(most_correct[1]),
+        },
+        "bias_analysis": {
+            "a_bias": float((contestant_answer_dist.get("A", 0) / total) * 100),
+            "b_bias": float((contestant_answer_dist.get("B", 0) / total) * 100),
+            "c_bias": float((contestant_answer_dist.get("C", 0) / total) * 100),
+            "d_bias": float((contestant_answer_dist.get("D", 0) / total) * 100),
+        },
+    }
 
 
-@app.route("/api/elimination_analysis")
-def get_elimination_analysis():
-    df = load_data()
+@app.route("/api/answer_choice_stats")
+def get_answer_choice_stats():
+    return jsonify(answer_choice_stats_payload(load_aggregates()))
+
 
-    # Elimination patterns
-    eliminated_df = df[df["eliminated"] == True]
+def elimination_analysis_payload(store):
+    by_level = store.rollup("level")
+    by_category = store.rollup("category")
 
     # By level
     elimination_by_level = {}
     # Use actual levels from the data instead of hardcoded range
-    for level in sorted(df["level"].unique()):
-        level_eliminations = eliminated_df[eliminated_df["level"] == level]
-        elimination_by_level[f"level_{level}"] = int(len(level_eliminations))
+    for level in store.levels:
+        elimination_by_level[f"level_{level}"] = int(by_level.loc[level, "eliminated"])
 
     # By category
     elimination_by_category = {}
-    for category in df["category"].unique():
-        cat_eliminations = eliminated_df[eliminated_df["category"] == category]
-        elimination_by_category[category] = int(len(cat_eliminations))
+    for category in store.categories:
+        elimination_by_category[category] = int(by_category.loc[category, "eliminated"])
 
     # Critical levels (most eliminations)
     level_elimination_counts = [
@@ -295,384 +757,238 @@ def get_elimination_analysis():
     ]
     level_elimination_counts.sort(key=lambda x: x[1], reverse=True)
 
-    return jsonify(
-        {
-            "total_eliminations": int(len(eliminated_df)),
-            "elimination_by_level": elimination_by_level,
-            "elimination_by_category": elimination_by_category,
-            "most_dangerous_levels": level_elimination_counts[:5],
-            "most_dangerous_category": (
-                max(elimination_by_category.items(), key=lambda x: x[1])
-                if elimination_by_category
-                else ("", 0)
-            ),
-            "safe_passage_rate": {
-                "before_level_5": (
-                    float(
-                        (
-                            (
-                                len(df[df["level"] < 5])
-                                - len(eliminated_df[eliminated_df["level"] < 5])
-                            )
-                            / len(df[df["level"] < 5])
-                        )
-                        * 100
-                    )
-                    if len(df[df["level"] < 5]) > 0
-                    else 0
-                ),
-                "level_5_to_10": (
-                    float(
-                        (
-                            (
-                                len(df[(df["level"] >= 5) & (df["level"] < 10)])
-                                - len(
-                                    eliminated_df[
-                                        (eliminated_df["level"] >= 5)
-                                        & (eliminated_df["level"] < 10)
-                                    ]
-                                )
-                            )
-                            / len(df[(df["level"] >= 5) & (df["level"] < 10)])
-                        )
-                        * 100
-                    )
-                    if len(df[(df["level"] >= 5) & (df["level"] < 10)]) > 0
-                    else 0
-                ),
-                "level_10_and_above": (
-                    float(
-                        (
-                            (
-                                len(df[df["level"] >= 10])
-                                - len(eliminated_df[eliminated_df["level"] >= 10])
-                            )
-                            / len(df[df["level"] >= 10])
-                        )
-                        * 100
-                    )
-                    if len(df[df["level"] >= 10]) > 0
-                    else 0
-                ),
-            },
-        }
-    )
+    def safe_passage_rate(low=None, high=None):
+        counts = store.level_range(low, high)
+        if counts["questions"] == 0:
+            return 0
+        return float(
+            ((counts["questions"] - counts["eliminated"]) / counts["questions"]) * 100
+        )
 
+    return {
+        "total_eliminations": store.totals()["eliminated"],
+        "elimination_by_level": elimination_by_level,
+        "elimination_by_category": elimination_by_category,
+        "most_dangerous_levels": level_elimination_counts[:5],
+        "most_dangerous_category": (
+            max(elimination_by_category.items(), key=lambda x: x[1])
+            if elimination_by_category
+            else ("", 0)
+        ),
+        "safe_passage_rate": {
+            "before_level_5": safe_passage_rate(high=5),
+            "level_5_to_10": safe_passage_rate(5, 10),
+            "level_10_and_above": safe_passage_rate(low=10),
+        },
+    }
 
-@app.route("/api/topic_preparation_guide")
-def get_topic_preparation_guide():
-    df = load_data()
+
+@app.route("/api/elimination_analysis")
+def get_elimination_analysis():
+    return jsonify(elimination_analysis_payload(load_aggregates()))
+
+
+def topic_preparation_guide_payload(store):
+    by_category = store.rollup("category")
+    by_category_level = store.rollup("category", "level")
 
     # Preparation recommendations
     preparation_guide = {}
 
-    for category in df["category"].unique():
-        cat_data = df[df["category"] == category]
+    for category in store.categories:
+        row = by_category.loc[category]
+        total = int(row["questions"])
+        accuracy = row["correct"] / total
 
         # Frequency by level ranges
-        early_levels = cat_data[cat_data["level"] <= 5]
-        mid_levels = cat_data[(cat_data["level"] > 5) & (cat_data["level"] <= 10)]
-        late_levels = cat_data[cat_data["level"] > 10]
+        early_levels = store.level_range(high=6, category=category)
+        mid_levels = store.level_range(6, 11, category=category)
+        late_levels = store.level_range(low=11, category=category)
+
+        # Most frequent levels, ascending like Series.mode()
+        level_counts = by_category_level.loc[category, "questions"]
+        common_levels = sorted(
+            level_counts[level_counts == level_counts.max()].index.tolist()
+        )
 
         preparation_guide[category] = {
-            "total_questions": int(len(cat_data)),
+            "total_questions": total,
             "difficulty_assessment": (
-                "Easy"
-                if cat_data["is_correct"].mean() > 0.7
-                else "Medium" if cat_data["is_correct"].mean() > 0.5 else "Hard"
+                "Easy" if accuracy > 0.7 else "Medium" if accuracy > 0.5 else "Hard"
             ),
-            "accuracy_rate": float(cat_data["is_correct"].mean() * 100),
-            "early_levels_count": int(len(early_levels)),
-            "mid_levels_count": int(len(mid_levels)),
-            "late_levels_count": int(len(late_levels)),
+            "accuracy_rate": float(accuracy * 100),
+            "early_levels_count": early_levels["questions"],
+            "mid_levels_count": mid_levels["questions"],
+            "late_levels_count": late_levels["questions"],
             "priority_score": float(
-                len(cat_data) * (1 - cat_data["is_correct"].mean())
+                total * (1 - accuracy)
             ),  # High frequency + low accuracy = high priority
-            "elimination_risk": int(len(cat_data[cat_data["eliminated"] == True])),
-            "common_levels": [
-                int(level) for level in cat_data["level"].mode().tolist()[:3]
-            ],
+            "elimination_risk": int(row["eliminated"]),
+            "common_levels": [int(level) for level in common_levels[:3]],
             "preparation_recommendation": (
                 "High Priority"
-                if len(cat_data) > 20 and cat_data["is_correct"].mean() < 0.6
-                else "Medium Priority" if len(cat_data) > 10 else "Low Priority"
+                if total > 20 and accuracy < 0.6
+                else "Medium Priority" if total > 10 else "Low Priority"
             ),
         }
-
     # Sort by priority score
     sorted_categories = sorted(
         preparation_guide.items(), key=lambda x: x[1]["priority_score"], reverse=True
     )
 
-    return jsonify(
-        {
-            "categories": preparation_guide,
-            "priority_order": [cat[0] for cat in sorted_categories],
-            "study_recommendations": {
-                "focus_categories": [cat[0] for cat in sorted_categories[:3]],
-                "review_categories": [cat[0] for cat in sorted_categories[3:6]],
-                "maintenance_categories": [cat[0] for cat in sorted_categories[6:]],
-            },
-        }
-    )
+    return {
+        "categories": preparation_guide,
+        "priority_order": [cat[0] for cat in sorted_categories],
+        "study_recommendations": {
+            "focus_categories": [cat[0] for cat in sorted_categories[:3]],
+            "review_categories": [cat[0] for cat in sorted_categories[3:6]],
+            "maintenance_categories": [cat[0] for cat in sorted_categories[6:]],
+        },
+    }
 
 
-@app.route("/api/detailed_answer_analysis")
-def get_detailed_answer_analysis():
-    df = load_data()
+@app.route("/api/topic_preparation_guide")
+def get_topic_preparation_guide():
+    return jsonify(topic_preparation_guide_payload(load_aggregates()))
 
-    # Comprehensive answer choice analysis
-    analysis = {
-        "overall_bias": {},
-        "level_bias": {},
-        "category_bias": {},
-        "difficulty_bias": {},
-        "before_after_level_7": {},
-        "elimination_pattern_bias": {},
-        "correct_vs_chosen_analysis": {},
-    }  # Overall bias analysis
-    total_questions = len(df)
-    df_with_answers = df[df["contestant_answer"].notna()]
-    total_answered = len(df_with_answers)
-
-    for choice in ["A", "B", "C", "D"]:
-        correct_count = len(df[df["correct_answer"] == choice])
-        chosen_count = len(
-            df_with_answers[df_with_answers["contestant_answer"] == choice]
-        )
 
-        correct_percentage = float((correct_count / total_questions) * 100)
+def choice_bias(counts):
+    """Bias per choice for one slice, percentages over answered questions only
+
+    ``counts`` is a (correct_answer, contestant_answer) matrix from
+    AggregateStore.answer_tensor().
+    """
+    total = int(counts.sum())
+    answered = total - int(counts[:, MISSING_ANSWER].sum())
+    correct_counts = counts.sum(axis=1)
+    chosen_counts = counts.sum(axis=0)
+
+    analysis = {}
+    for i, choice in enumerate(CHOICES):
+        correct_count = int(correct_counts[i])
+        chosen_count = int(chosen_counts[i])
+
+        correct_percentage = float((correct_count / total) * 100) if total > 0 else 0
         chosen_percentage = (
-            float((chosen_count / total_answered) * 100) if total_answered > 0 else 0
+            float((chosen_count / answered) * 100) if answered > 0 else 0
         )
 
-        analysis["overall_bias"][choice] = {
+        analysis[choice] = {
             "correct_percentage": correct_percentage,
             "chosen_percentage": chosen_percentage,
             "bias_score": float(chosen_percentage - correct_percentage),
-            "correct_count": int(correct_count),
-            "chosen_count": int(chosen_count),
-            "total_questions": int(total_questions),
-            "answered_questions": int(total_answered),
-        }  # Level-specific bias analysis
-    for level in sorted(df["level"].unique()):
-        level_data = df[df["level"] == level]
-
-        # Filter out rows with missing contestant answers for percentage calculations
-        level_data_with_answers = level_data[level_data["contestant_answer"].notna()]
-        level_total = len(level_data)
-        level_answered_total = len(level_data_with_answers)
-
-        level_analysis = {}
-        for choice in ["A", "B", "C", "D"]:
-            correct_at_level = len(level_data[level_data["correct_answer"] == choice])
-            chosen_at_level = len(
-                level_data_with_answers[
-                    level_data_with_answers["contestant_answer"] == choice
-                ]
-            )
-
-            # Calculate percentages based on answered questions only
-            correct_percentage = (
-                float((correct_at_level / level_total) * 100) if level_total > 0 else 0
-            )
-            chosen_percentage = (
-                float((chosen_at_level / level_answered_total) * 100)
-                if level_answered_total > 0
-                else 0
-            )
-
-            level_analysis[choice] = {
-                "correct_percentage": correct_percentage,
-                "chosen_percentage": chosen_percentage,
-                "bias_score": float(chosen_percentage - correct_percentage),
-                "correct_count": int(correct_at_level),
-                "chosen_count": int(chosen_at_level),
-                "total_questions": int(level_total),
-                "answered_questions": int(level_answered_total),
-            }
-
-        analysis["level_bias"][
-            f"level_{level}"
-        ] = level_analysis  # Category-specific bias analysis
-    for category in df["category"].unique():
-        cat_data = df[df["category"] == category]
-
-        # Filter out rows with missing contestant answers for percentage calculations
-        cat_data_with_answers = cat_data[cat_data["contestant_answer"].notna()]
-        cat_total = len(cat_data)
-        cat_answered_total = len(cat_data_with_answers)
-
-        category_analysis = {}
-        for choice in ["A", "B", "C", "D"]:
-            correct_in_cat = len(cat_data[cat_data["correct_answer"] == choice])
-            chosen_in_cat = len(
-                cat_data_with_answers[
-                    cat_data_with_answers["contestant_answer"] == choice
-                ]
-            )
-
-            # Calculate percentages based on answered questions only
-            correct_percentage = (
-                float((correct_in_cat / cat_total) * 100) if cat_total > 0 else 0
-            )
-            chosen_percentage = (
-                float((chosen_in_cat / cat_answered_total) * 100)
-                if cat_answered_total > 0
-                else 0
-            )
-
-            category_analysis[choice] = {
-                "correct_percentage": correct_percentage,
-                "chosen_percentage": chosen_percentage,
-                "bias_score": float(chosen_percentage - correct_percentage),
-                "correct_count": int(correct_in_cat),
-                "chosen_count": int(chosen_in_cat),
-                "total_questions": int(cat_total),
-                "answered_questions": int(cat_answered_total),
-            }
+            "correct_count": correct_count,
+            "chosen_count": chosen_count,
+            "total_questions": total,
+            "answered_questions": answered,
+        }
+    return analysis
 
-        analysis["category_bias"][category] = category_analysis
 
-    # Difficulty-based bias (by accuracy rate)
-    easy_questions = df[df["is_correct"] == True]
-    hard_questions = df[df["is_correct"] == False]
+def situational_bias(counts):
+    """Bias per choice for one slice, percentages over all of its questions"""
+    total = int(counts.sum())
+    correct_counts = counts.sum(axis=1)
+    chosen_counts = counts.sum(axis=0)
 
-    for difficulty, data in [("easy", easy_questions), ("hard", hard_questions)]:
-        diff_total = len(data)
-        diff_analysis = {}
+    analysis = {}
+    for i, choice in enumerate(CHOICES):
+        correct_count = int(correct_counts[i])
+        chosen_count = int(chosen_counts[i])
 
-        for choice in ["A", "B", "C", "D"]:
-            correct_in_diff = len(data[data["correct_answer"] == choice])
-            chosen_in_diff = len(data[data["contestant_answer"] == choice])
+        analysis[choice] = {
+            "correct_percentage": (
+                float((correct_count / total) * 100) if total > 0 else 0
+            ),
+            "chosen_percentage": (
+                float((chosen_count / total) * 100) if total > 0 else 0
+            ),
+            "bias_score": (
+                float((chosen_count - correct_count) / total * 100) if total > 0 else 0
+            ),
+            "correct_count": correct_count,
+            "chosen_count": chosen_count,
+        }
+    return analysis
 
-            diff_analysis[choice] = {
-                "correct_percentage": (
-                    float((correct_in_diff / diff_total) * 100) if diff_total > 0 else 0
-                ),
-                "chosen_percentage": (
-                    float((chosen_in_diff / diff_total) * 100) if diff_total > 0 else 0
-                ),
-                "bias_score": (
-                    float((chosen_in_diff - correct_in_diff) / diff_total * 100)
-                    if diff_total > 0
-                    else 0
-                ),
-                "correct_count": int(correct_in_diff),
-                "chosen_count": int(chosen_in_diff),
-            }
 
-        analysis["difficulty_bias"][
-            difficulty
-        ] = diff_analysis  # Before vs After Level 7 analysis
-    before_7 = df[df["level"] < 7]
-    after_7 = df[df["level"] >= 7]
-
-    for period, data in [("before_level_7", before_7), ("level_7_and_after", after_7)]:
-        # Filter out rows with missing contestant answers for percentage calculations
-        data_with_answers = data[data["contestant_answer"].notna()]
-        period_total = len(data)
-        period_answered_total = len(data_with_answers)
-
-        period_analysis = {}
-        for choice in ["A", "B", "C", "D"]:
-            correct_in_period = len(data[data["correct_answer"] == choice])
-            chosen_in_period = len(
-                data_with_answers[data_with_answers["contestant_answer"] == choice]
-            )
-
-            # Calculate percentages based on answered questions only
-            correct_percentage = (
-                float((correct_in_period / period_total) * 100)
-                if period_total > 0
-                else 0
-            )
-            chosen_percentage = (
-                float((chosen_in_period / period_answered_total) * 100)
-                if period_answered_total > 0
-                else 0
-            )
-
-            period_analysis[choice] = {
-                "correct_percentage": correct_percentage,
-                "chosen_percentage": chosen_percentage,
-                "bias_score": float(chosen_percentage - correct_percentage),
-                "correct_count": int(correct_in_period),
-                "chosen_count": int(chosen_in_period),
-                "total_questions": int(period_total),
-                "answered_questions": int(period_answered_total),
-            }
+def detailed_answer_analysis_payload(store):
 
-        analysis["before_after_level_7"][period] = period_analysis
+    # Every slice is read from (slice, correct_answer, contestant_answer) counts
+    overall = store.answer_tensor()[1][0]
+    overall_correct = store.answer_tensor(value="correct")[1][0]
+    overall_eliminated = store.answer_tensor(value="eliminated")[1][0]
+    level_labels, by_level = store.answer_tensor("level")
+    category_labels, by_category = store.answer_tensor("category")
 
-    # Elimination pattern bias
-    eliminated_questions = df[df["eliminated"] == True]
-    safe_questions = df[df["eliminated"] == False]
-
-    for situation, data in [
-        ("eliminated", eliminated_questions),
-        ("safe", safe_questions),
-    ]:
-        sit_total = len(data)
-        sit_analysis = {}
+    # Comprehensive answer choice analysis
+    analysis = {
+        "overall_bias": choice_bias(overall),
+        "level_bias": {},
+        "category_bias": {},
+        "difficulty_bias": {
+            "easy": situational_bias(overall_correct),
+            "hard": situational_bias(overall - overall_correct),
+        },
+        "before_after_level_7": {},
+        "elimination_pattern_bias": {
+            "eliminated": situational_bias(overall_eliminated),
+            "safe": situational_bias(overall - overall_eliminated),
+        },
+        "correct_vs_chosen_analysis": {},
+    }
 
-        for choice in ["A", "B", "C", "D"]:
-            correct_in_sit = len(data[data["correct_answer"] == choice])
-            chosen_in_sit = len(data[data["contestant_answer"] == choice])
+    # Level-specific bias analysis
+    level_index = {level: i for i, level in enumerate(level_labels)}
+    for level in store.levels:
+        analysis["level_bias"][f"level_{level}"] = choice_bias(
+            by_level[level_index[level]]
+        )
 
-            sit_analysis[choice] = {
-                "correct_percentage": (
-                    float((correct_in_sit / sit_total) * 100) if sit_total > 0 else 0
-                ),
-                "chosen_percentage": (
-                    float((chosen_in_sit / sit_total) * 100) if sit_total > 0 else 0
-                ),
-                "bias_score": (
-                    float((chosen_in_sit - correct_in_sit) / sit_total * 100)
-                    if sit_total > 0
-                    else 0
-                ),
-                "correct_count": int(correct_in_sit),
-                "chosen_count": int(chosen_in_sit),
-            }
+    # Category-specific bias analysis
+    category_index = {category: i for i, category in enumerate(category_labels)}
+    for category in store.categories:
+        analysis["category_bias"][category] = choice_bias(
+            by_category[category_index[category]]
+        )
 
-        analysis["elimination_pattern_bias"][situation] = sit_analysis
+    # Before vs After Level 7 analysis
+    before_7 = np.asarray(level_labels) < 7
+    analysis["before_after_level_7"] = {
+        "before_level_7": choice_bias(by_level[before_7].sum(axis=0)),
+        "level_7_and_after": choice_bias(by_level[~before_7].sum(axis=0)),
+    }
 
     # Correct vs Chosen detailed analysis
     choice_performance = {}
-    for choice in ["A", "B", "C", "D"]:
+    for i, choice in enumerate(CHOICES):
+        total_correct = int(overall[i, :].sum())
+        total_chosen = int(overall[:, i].sum())
+
         # When this choice is correct, how often is it chosen?
-        correct_choice_data = df[df["correct_answer"] == choice]
-        chosen_when_correct = len(
-            correct_choice_data[correct_choice_data["contestant_answer"] == choice]
-        )
+        chosen_when_correct = int(overall[i, i])
 
         # When this choice is chosen, how often is it correct?
-        chosen_choice_data = df[df["contestant_answer"] == choice]
-        correct_when_chosen = len(
-            chosen_choice_data[chosen_choice_data["is_correct"] == True]
-        )
+        correct_when_chosen = int(overall_correct[:, i].sum())
 
         choice_performance[choice] = {
             "recognition_rate": (
-                float((chosen_when_correct / len(correct_choice_data)) * 100)
-                if len(correct_choice_data) > 0
+                float((chosen_when_correct / total_correct) * 100)
+                if total_correct > 0
                 else 0
             ),
             "accuracy_when_chosen": (
-                float((correct_when_chosen / len(chosen_choice_data)) * 100)
-                if len(chosen_choice_data) > 0
+                float((correct_when_chosen / total_chosen) * 100)
+                if total_chosen > 0
                 else 0
             ),
             "overconfidence": (
-                float((len(chosen_choice_data) / len(correct_choice_data)) * 100)
-                if len(correct_choice_data) > 0
-                else 0
+                float((total_chosen / total_correct) * 100) if total_correct > 0 else 0
             ),
-            "total_correct": int(len(correct_choice_data)),
-            "total_chosen": int(len(chosen_choice_data)),
-            "correctly_identified": int(chosen_when_correct),
-            "wrongly_chosen": int(len(chosen_choice_data) - correct_when_chosen),
+            "total_correct": total_correct,
+            "total_chosen": total_chosen,
+            "correctly_identified": chosen_when_correct,
+            "wrongly_chosen": total_chosen - correct_when_chosen,
         }
 
     analysis["correct_vs_chosen_analysis"] = choice_performance
@@ -718,33 +1034,79 @@ def get_detailed_answer_analysis():
         },
     }
 
-    return jsonify(analysis)
+    return analysis
 
 
-@app.route("/api/pattern_analysis")
-def get_pattern_analysis():
-    # Import and run the pattern analysis
-    from pattern_analysis import ContestantPatternAnalyzer
+@app.route("/api/detailed_answer_analysis")
+def get_detailed_answer_analysis():
+    return jsonify(detailed_answer_analysis_payload(load_aggregates()))
 
-    analyzer = ContestantPatternAnalyzer("csv/milyoner_data_final.csv")
-    report = analyzer.generate_comprehensive_report()
-
-    # Convert complex data structures for JSON serialization
-    def convert_counters(obj):
-        if isinstance(obj, Counter):
-            return dict(obj)
-        elif isinstance(obj, defaultdict):
-            return dict(obj)
-        elif isinstance(obj, dict):
-            return {k: convert_counters(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_counters(item) for item in obj]
-        return obj
 
-    # Clean the report for JSON serialization
-    clean_report = convert_counters(report)
+# Sections of /api/dashboard, each also served by its own /api/<name> endpoint
+DASHBOARD_SECTIONS = {
+    "stats": stats_payload,
+    "category_stats": category_stats_payload,
+    "level_stats": level_stats_payload,
+    "joker_stats": joker_stats_payload,
+    "answer_choice_stats": answer_choice_stats_payload,
+    "elimination_analysis": elimination_analysis_payload,
+    "topic_preparation_guide": topic_preparation_guide_payload,
+    "detailed_answer_analysis": detailed_answer_analysis_payload,
+}
+
+
+@app.route("/api/dashboard")
+def get_dashboard():
+    # Every section is sliced from the same aggregate store in one request
+    store = load_aggregates()
+    return jsonify({name: build(store) for name, build in DASHBOARD_SECTIONS.items()})
+
+
+def parse_sections(value):
+    """Validate a comma-separated ``sections`` parameter against REPORT_SECTIONS"""
+    from pattern_analysis import REPORT_SECTIONS
+
+    sections = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in sections if name not in REPORT_SECTIONS]
+    if unknown:
+        raise ValueError(f"unknown sections: {', '.join(unknown)}")
+    if not sections:
+        raise ValueError("sections must name at least one report section")
+    return sections
+
+
+@app.route("/api/pattern_analysis")
+def get_pattern_analysis():
+    if "sections" in request.args:
+        # Only the requested sections are computed, the rest stay untouched
+        try:
+            sections = parse_sections(request.args["sections"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # One serialized body per set of sections and dataset version
+        sections = sorted(set(sections))
+        body = dataset_cache.derived(
+            f"pattern_report:{','.join(sections)}",
+            lambda snapshot: build_pattern_sections(snapshot, sections),
+        )
+    else:
+        body = dataset_cache.derived("pattern_report", build_pattern_report)
+    return app.response_class(body, mimetype="application/json")
+
+
+@app.route("/api/pattern_prediction")
+def get_pattern_prediction():
+    # Choices made so far, oldest first, e.g. ?choices=A,C,B
+    choices = [
+        choice.strip()
+        for choice in request.args.get("choices", "").split(",")
+        if choice.strip()
+    ]
+    if not choices:
+        return jsonify({"error": "choices must list at least one answer"}), 400
 
-    return jsonify(clean_report)
+    prediction = load_reliability_index().lookup(choices)
+    return jsonify({"choices": choices, "prediction": prediction})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Time the /api/* endpoints of app.py on a synthetic dataset
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import app as dashboard
+from synthetic_data import generate_dataset
+
+ENDPOINTS = [
+    "/api/stats",
+    "/api/category_stats",
+    "/api/level_stats",
+    "/api/joker_stats",
+    "/api/answer_choice_stats",
+    "/api/elimination_analysis",
+    "/api/topic_preparation_guide",
+    "/api/detailed_answer_analysis",
+]
+
+
+def benchmark(rows, repeat=3, seed=0, endpoints=ENDPOINTS):
+    """Return {endpoint: {"first": seconds, "best": seconds}}"""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "milyoner_data_synthetic.csv")
+        generate_dataset(rows, seed=seed).to_csv(csv_file, index=False)
+
+        dashboard.dataset_cache = dashboard.DatasetCache(csv_file)
+        client = dashboard.app.test_client()
+
+        # Parse the CSV up front so the timings cover request handling only
+        dashboard.load_data()
+
+        results = {}
+        for endpoint in endpoints:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = client.get(endpoint)
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{endpoint} returned {response.status_code}")
+            results[endpoint] = {"first": timings[0], "best": min(timings)}
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"Benchmarking API endpoints on {args.rows} synthetic rows...")
+    results = benchmark(args.rows, repeat=args.repeat, seed=args.seed)
+
+    print(f"\n{'endpoint':<36}{'first (ms)':>12}{'best (ms)':>12}")
+    for endpoint, timing in results.items():
+        print(
+            f"{endpoint:<36}{timing['first'] * 1000:>12.1f}{timing['best'] * 1000:>12.1f}"
+        )
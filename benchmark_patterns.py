@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Time ContestantPatternAnalyzer on synthetic datasets of increasing size
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from pattern_analysis import ContestantPatternAnalyzer
+from synthetic_data import generate_dataset
+
+DEFAULT_SIZES = [3_000, 100_000, 1_000_000]
+
+# Analyzer steps, each timed on a freshly built analyzer so memoized work
+# shared between methods is always counted for the step being measured
+STEPS = {
+    "transition_matrices": lambda analyzer: analyzer.transition_matrices,
+    "performance_clusters": lambda analyzer: analyzer.performance_clusters,
+    "first_choice_patterns": lambda analyzer: analyzer.analyze_first_choice_patterns(),
+    "sequential_patterns": lambda analyzer: analyzer.analyze_sequential_patterns(),
+    "deep_sequential_patterns": lambda analyzer: analyzer.analyze_deep_sequential_patterns(),
+    "correct_wrong_patterns": lambda analyzer: analyzer.analyze_correct_wrong_patterns(),
+    "level_based_patterns": lambda analyzer: analyzer.analyze_level_based_patterns(),
+    "winning_patterns": lambda analyzer: analyzer.find_winning_patterns(),
+    "reliability_index": lambda analyzer: analyzer.reliability_index,
+    "comprehensive_report": lambda analyzer: analyzer.generate_comprehensive_report(),
+}
+
+
+def measure(setup, run, memory=True):
+    """Return (seconds, peak MiB or None) of ``run(setup())``, excluding setup"""
+    # generate_comprehensive_report() prints progress; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        target = setup()
+        start = time.perf_counter()
+        run(target)
+        seconds = time.perf_counter() - start
+
+        peak = None
+        if memory:
+            # Traced separately: tracemalloc slows allocation-heavy code down
+            target = setup()
+            tracemalloc.start()
+            try:
+                run(target)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+            finally:
+                tracemalloc.stop()
+
+    return seconds, peak
+
+
+def benchmark(rows, seed=0, steps=None, workers=1, memory=True):
+    """Return one {"rows", "step", "seconds", "peak_mib"} record per step"""
+    df = generate_dataset(rows, seed=seed)
+
+    def analyzer():
+        return ContestantPatternAnalyzer(df, workers=workers)
+
+    seconds, peak = measure(lambda: df, lambda _: analyzer(), memory)
+    results = [
+        {"rows": len(df), "step": "construction", "seconds": seconds, "peak_mib": peak}
+    ]
+    for step in steps or STEPS:
+        seconds, peak = measure(analyzer, STEPS[step], memory)
+        results.append(
+            {"rows": len(df), "step": step, "seconds": seconds, "peak_mib": peak}
+        )
+
+    return results
+
+
+def environment():
+    """Commit and library versions the results were measured with"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def compare(baseline, results):
+    """Print each step's time relative to a previous results file"""
+    previous = {(r["rows"], r["step"]): r["seconds"] for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline['environment'].get('commit') or 'baseline'}:")
+    print(f"{'rows':>10}  {'step':<26}{'before (s)':>12}{'after (s)':>12}{'ratio':>8}")
+    for record in results:
+        before = previous.get((record["rows"], record["step"]))
+        if before is None:
+            continue
+        ratio = record["seconds"] / before if before else float("inf")
+        print(
+            f"{record['rows']:>10}  {record['step']:<26}"
+            f"{before:>12.3f}{record['seconds']:>12.3f}{ratio:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--steps", nargs="+", choices=list(STEPS), help="steps to time (default: all)"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory runs"
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results file to compare against")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>10}  {'step':<26}{'seconds':>10}{'peak (MiB)':>12}")
+    for rows in args.sizes:
+        for record in benchmark(
+            rows,
+            seed=args.seed,
+            steps=args.steps,
+            workers=args.workers,
+            memory=not args.no_memory,
+        ):
+            peak = record["peak_mib"]
+            peak = "-" if peak is None else f"{peak:.1f}"
+            print(
+                f"{record['rows']:>10}  {record['step']:<26}"
+                f"{record['seconds']:>10.3f}{peak:>12}"
+            )
+            results.append(record)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "environment": environment(),
+                    "settings": {
+                        "seed": args.seed,
+                        "workers": args.workers,
+                        "memory": not args.no_memory,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
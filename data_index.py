@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+# Columns that can be filtered by exact value in DataIndex.query()
+EQUALITY_FILTERS = ["video_id", "contestant", "category", "joker_used", "is_correct"]
+
+
+class DataIndex:
+    """Row-position indexes over the dataset, built once per dataset version
+
+    Filters are answered from per-value position lists and a level ordering,
+    and sort orders are memoized per column, so serving a page of rows does
+    not scan the whole frame.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.columns = df.columns.tolist()
+        self._positions = {}
+        self._sort_keys = {}
+        self._orders = {}
+
+        levels = df["level"].to_numpy()
+        self._level_order = np.argsort(levels, kind="stable")
+        self._sorted_levels = levels[self._level_order]
+
+    def positions(self, column, value):
+        """Sorted row positions where ``column == value``"""
+        if column not in self._positions:
+            self._positions[column] = {
+                key: np.asarray(rows)
+                for key, rows in self.df.groupby(column, sort=False).indices.items()
+            }
+        return self._positions[column].get(value, np.array([], dtype=np.intp))
+
+    def level_positions(self, level_min=None, level_max=None):
+        """Sorted row positions with ``level_min <= level <= level_max``"""
+        start = 0
+        end = len(self._sorted_levels)
+        if level_min is not None:
+            start = np.searchsorted(self._sorted_levels, level_min, side="left")
+        if level_max is not None:
+            end = np.searchsorted(self._sorted_levels, level_max, side="right")
+        return np.sort(self._level_order[start:end])
+
+    def _sort_key(self, column, descending):
+        """Integer key per row ordering ``column``, missing values last"""
+        if (column, descending) not in self._sort_keys:
+            codes, uniques = pd.factorize(self.df[column], sort=True)
+            key = -codes if descending else codes.copy()
+            key[codes == -1] = 1 if descending else len(uniques)
+            self._sort_keys[(column, descending)] = key
+        return self._sort_keys[(column, descending)]
+
+    def order(self, column, descending=False, rows=None):
+        """Row positions sorted by ``column``, ties kept in dataset order"""
+        key = self._sort_key(column, descending)
+        if rows is None:
+            if (column, descending) not in self._orders:
+                self._orders[(column, descending)] = np.argsort(key, kind="stable")
+            return self._orders[(column, descending)]
+        return rows[np.argsort(key[rows], kind="stable")]
+
+    def query(
+        self,
+        filters=None,
+        level_min=None,
+        level_max=None,
+        sort=None,
+        descending=False,
+    ):
+        """Row positions matching every filter, in the requested order
+
+        ``filters`` maps EQUALITY_FILTERS columns to a list of accepted values.
+        Returns None for "all rows in dataset order" so callers can slice a
+        page without materializing the full position list.
+        """
+        candidates = []
+        for column, values in (filters or {}).items():
+            matches = [self.positions(column, value) for value in values]
+            # np.unique also drops repeats of the same value (?category=X&category=X)
+            candidates.append(np.unique(np.concatenate(matches)))
+        if level_min is not None or level_max is not None:
+            candidates.append(self.level_positions(level_min, level_max))
+
+        rows = None
+        # Intersect the most selective lists first
+        for positions in sorted(candidates, key=len):
+            if rows is None:
+                rows = positions
+            else:
+                rows = np.intersect1d(rows, positions, assume_unique=True)
+
+        if sort is not None:
+            return self.order(sort, descending, rows)
+        return rows
+
+    def _select(self, rows, offset, limit):
+        if limit is None:
+            limit = len(self.df)
+        if rows is None:
+            return np.arange(offset, min(offset + limit, len(self.df)))
+        return rows[offset : offset + limit]
+
+    def page(self, rows, offset=0, limit=None, fields=None):
+        """Records for ``rows[offset:offset + limit]`` (all rows if rows is None)"""
+        frame = self.df.iloc[self._select(rows, offset, limit)]
+        if fields is not None:
+            frame = frame[fields]
+        return frame.to_dict("records")
+
+    def iter_frames(self, rows, offset=0, limit=None, fields=None, chunk_size=1000):
+        """Yield the selected rows as DataFrames of at most ``chunk_size`` rows"""
+        selected = self._select(rows, offset, limit)
+        for start in range(0, len(selected), chunk_size):
+            frame = self.df.iloc[selected[start : start + chunk_size]]
+            if fields is not None:
+                frame = frame[fields]
+            yield frame
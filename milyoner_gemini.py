@@ -1,46 +1,517 @@
+import argparse
+import hashlib
+import json
 import re
 import os
+import random
+import threading
+import time
 import pandas as pd
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from youtube_transcript_api import YouTubeTranscriptApi
 from google import genai
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize clients with environment variables
-google_ai_api_key = os.getenv("GOOGLE_AI_API_KEY")
-if not google_ai_api_key:
-    raise ValueError("GOOGLE_AI_API_KEY environment variable is required")
-
-client = genai.Client(api_key=google_ai_api_key)
-
 # Extract playlist ID from environment variables
 playlist_id = "PLsD-lH1jaVRP--NiDw0ekIYNcwA1D1q_g"
 
 api_key = os.getenv("YOUTUBE_API_KEY")
-if not api_key:
-    raise ValueError("YOUTUBE_API_KEY environment variable is required")
+
+# Videos main() works on at the same time; 1 processes them one by one
+VIDEOS_IN_FLIGHT = int(os.getenv("VIDEOS_IN_FLIGHT", "4"))
+
+# Upper bound on calls per second for each external stage
+TRANSCRIPT_CALLS_PER_SECOND = float(os.getenv("TRANSCRIPT_CALLS_PER_SECOND", "2"))
+LLM_CALLS_PER_SECOND = float(os.getenv("LLM_CALLS_PER_SECOND", "1"))
+
+MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+# Model responses are kept by content hash; oldest entries go past the size limit
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "llm_cache")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(512 * 2**20)))
+
+# Transcripts longer than CHUNK_CHARS are extracted in overlapping chunks
+CHUNK_CHARS = int(os.getenv("CHUNK_CHARS", "12000"))
+CHUNK_OVERLAP_CHARS = int(os.getenv("CHUNK_OVERLAP_CHARS", "1500"))
+CHUNKS_IN_FLIGHT = int(os.getenv("CHUNKS_IN_FLIGHT", "4"))
+# Length of the contestant introduction repeated at the top of later chunks
+CONTESTANT_INTRO_CHARS = int(os.getenv("CONTESTANT_INTRO_CHARS", "300"))
+
+# Per-video ingestion journal; each stage is recorded once its output is on disk
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "jobs")
+STAGES = ["fetched", "extracted", "parsed", "cleaned", "written"]
+
+# Host phrases that open a new question or introduce a contestant
+QUESTION_BOUNDARY = re.compile(
+    r"\b(?:\d+\.\s*soru|sorumuz|soru geliyor)", re.IGNORECASE
+)
+CONTESTANT_BOUNDARY = re.compile(r"\b(?:yarışmacımız|hoş geldin)", re.IGNORECASE)
+SEGMENT_BOUNDARY = re.compile(
+    f"{QUESTION_BOUNDARY.pattern}|{CONTESTANT_BOUNDARY.pattern}", re.IGNORECASE
+)
+
+
+# Retry policy shared by every external call
+CALL_ATTEMPTS = int(os.getenv("CALL_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = float(os.getenv("BACKOFF_BASE_SECONDS", "1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("BACKOFF_MAX_SECONDS", "60"))
+
+# Consecutive transient failures that pause a service, and for how long
+CIRCUIT_FAILURES = int(os.getenv("CIRCUIT_FAILURES", "5"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+
+# Per-call timeouts; model calls on a full chunk can take minutes
+TRANSCRIPT_TIMEOUT_SECONDS = float(os.getenv("TRANSCRIPT_TIMEOUT_SECONDS", "30"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "300"))
+PLAYLIST_TIMEOUT_SECONDS = float(os.getenv("PLAYLIST_TIMEOUT_SECONDS", "30"))
+
+# Timed-out watchdog calls still running, per service, before calls are refused
+ABANDONED_CALLS_MAX = int(os.getenv("ABANDONED_CALLS_MAX", "8"))
+
+# Error types worth retrying, matched by name anywhere in the exception's MRO so
+# requests, httpx (used by google-genai) and youtube_transcript_api errors are
+# recognised without importing each library's exception module
+TRANSIENT_ERRORS = {
+    "TimeoutError",
+    "ConnectionError",
+    "Timeout",
+    "TimeoutException",
+    "NetworkError",
+    "RemoteProtocolError",
+    "TooManyRequests",
+    "RequestBlocked",
+    "IpBlocked",
+}
+
+
+def error_status(error):
+    """HTTP status carried by a requests or google-genai error, if any"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(error):
+    """Whether retrying ``error`` later can succeed: timeouts, 429 and 5xx"""
+    if any(cls.__name__ in TRANSIENT_ERRORS for cls in type(error).__mro__):
+        return True
+    status = error_status(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait in a Retry-After header, if any
+
+    Capped at BACKOFF_MAX_SECONDS so one header cannot park a worker thread
+    for hours; a service that keeps refusing trips the circuit breaker.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        seconds = float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+    return min(max(seconds, 0.0), BACKOFF_MAX_SECONDS)
+
+
+class TokenBucket:
+    """Allow ``rate`` calls per second on average, in bursts of up to ``burst``
+
+    Shared across threads. A caller that finds the bucket empty reserves the
+    next token and sleeps outside the lock until it is due.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """Pause every caller of a service after repeated transient failures
+
+    After ``threshold`` consecutive failures the circuit opens for
+    ``cooldown`` seconds; callers wait it out instead of hammering a service
+    that is rate limiting or down. The next failure after reopening trips it
+    again, any success closes it.
+    """
+
+    def __init__(self, name, threshold, cooldown):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self._lock:
+                delay = self._open_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                print(
+                    f"[{self.name}] {self._failures} failures in a row, "
+                    f"pausing calls for {self.cooldown:g}s"
+                )
+
+
+class ServiceClient:
+    """Rate limited, retrying access to one external service
+
+    ``call(fn, *args, **kwargs)`` waits for a closed circuit and a token,
+    then runs ``fn``. Transient errors are retried up to ``attempts`` times
+    with full-jitter exponential backoff (or the server's Retry-After);
+    other errors are raised at once. ``timeout`` is passed by callers to
+    libraries that accept one; with ``watchdog=True`` the call itself is
+    abandoned after ``timeout`` seconds for libraries that do not. Threads
+    of abandoned calls cannot be killed, so once ``ABANDONED_CALLS_MAX`` of
+    them are still running new calls fail instead of starting more.
+    """
+
+    def __init__(
+        self,
+        name,
+        rate,
+        timeout,
+        burst=1,
+        attempts=CALL_ATTEMPTS,
+        watchdog=False,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.attempts = attempts
+        self.watchdog = watchdog
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(name, CIRCUIT_FAILURES, CIRCUIT_COOLDOWN_SECONDS)
+        self._abandoned = []
+        self._abandoned_lock = threading.Lock()
+
+    def call(self, fn, *args, **kwargs):
+        for attempt in range(1, self.attempts + 1):
+            self.breaker.wait()
+            self.bucket.acquire()
+            try:
+                result = self._run(fn, args, kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.attempts:
+                    raise
+                backoff = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+                delay = max(random.uniform(0, backoff), retry_after(e) or 0)
+                print(
+                    f"[{self.name}] {type(e).__name__}: {e}; "
+                    f"retry {attempt}/{self.attempts - 1} in {delay:.1f}s"
+                )
+                time.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+    def _run(self, fn, args, kwargs):
+        if not self.watchdog:
+            return fn(*args, **kwargs)
+
+        with self._abandoned_lock:
+            self._abandoned = [t for t in self._abandoned if t.is_alive()]
+            if len(self._abandoned) >= ABANDONED_CALLS_MAX:
+                raise RuntimeError(
+                    f"{self.name}: {len(self._abandoned)} timed-out calls "
+                    "are still running; not starting another"
+                )
+
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+
+        # Daemon thread: a hung call is left behind rather than blocking exit
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        if thread.is_alive():
+            with self._abandoned_lock:
+                self._abandoned.append(thread)
+                running = len(self._abandoned)
+            print(f"[{self.name}] abandoned a hung call, {running} still running")
+            raise TimeoutError(f"{self.name} call took longer than {self.timeout}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+
+def write_atomic(path, write):
+    """Call ``write(tmp_path)``, then move the file into place in one step
+
+    Readers, and runs resumed after a crash, see either the old file or the
+    complete new one, never a partial write.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_text(path, text):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    write_atomic(path, write)
+
+
+def write_csv(df, path):
+    write_atomic(
+        path,
+        lambda tmp_path: df.to_csv(tmp_path, index=False, quoting=csv.QUOTE_NONNUMERIC),
+    )
+
+
+class JobJournal:
+    """Last completed ingestion stage of every video, one JSON file each
+
+    ``directory/<video id>.json`` holds the video's URL, the last stage of
+    STAGES whose output was written, the extraction_key() that stage was
+    produced under, and the error that stopped it, if any. The transcript
+    and parsed rows are kept next to it in ``<video id>.transcript.txt``
+    and ``<video id>.rows.json``, and ``run.json`` lists the video URLs of
+    the last run in order.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, video_id, suffix=".json"):
+        return os.path.join(self.directory, f"{video_id}{suffix}")
+
+    def get(self, video_id):
+        try:
+            with open(self._path(video_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"video_id": video_id, "url": None, "stage": None, "error": None}
+
+    def done(self, video_id, stage, extraction=None):
+        """Whether ``stage`` (or a later one) completed for ``video_id``
+
+        Stages after "fetched" hold model output, so they only count if they
+        were recorded under the same ``extraction`` key.
+        """
+        entry = self.get(video_id)
+        current = entry["stage"]
+        if current is None or STAGES.index(current) < STAGES.index(stage):
+            return False
+        if stage == "fetched":
+            return os.path.exists(self._path(video_id, ".transcript.txt"))
+        return entry.get("extraction") == extraction
+
+    def record(self, video_id, url, stage=None, error=None, extraction=None):
+        entry = self.get(video_id)
+        entry.update(
+            url=url,
+            stage=stage or entry["stage"],
+            error=error,
+            updated=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+        if extraction is not None:
+            entry["extraction"] = extraction
+        write_text(self._path(video_id), json.dumps(entry, ensure_ascii=False))
+
+    def save_transcript(self, video_id, text):
+        write_text(self._path(video_id, ".transcript.txt"), text)
+
+    def load_transcript(self, video_id):
+        with open(self._path(video_id, ".transcript.txt"), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def save_rows(self, video_id, rows):
+        write_text(
+            self._path(video_id, ".rows.json"), json.dumps(rows, ensure_ascii=False)
+        )
+
+    def load_rows(self, video_id):
+        with open(self._path(video_id, ".rows.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_run(self, video_urls):
+        write_text(os.path.join(self.directory, "run.json"), json.dumps(video_urls))
+
+    def load_run(self):
+        """Video URLs of the last run, None if no run was recorded"""
+        try:
+            with open(
+                os.path.join(self.directory, "run.json"), "r", encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+class ResponseCache:
+    """Model responses stored under the hash of everything that produced them
+
+    Entries live in ``directory/<2 hex chars>/<sha256>.txt``. Reads refresh
+    an entry's modification time. Once a write takes the store past
+    ``max_bytes``, the least recently used entries are evicted down to
+    LOW_WATER of it, so the next writes do not rescan the store.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model, prompt, text):
+        content = "\0".join([model, prompt, text]).encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def _entries(self):
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".txt"):
+                        yield entry
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted since it was read; the text is still good
+        return text
+
+    def put(self, key, text):
+        path = self._path(key)
+
+        # Written under the lock so an overwrite's old size is the one replaced
+        with self._lock:
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            write_text(path, text)
+
+            if self._size is None:
+                self._size = sum(entry.stat().st_size for entry in self._entries())
+            else:
+                self._size += os.path.getsize(path) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in self._entries()
+        )
+        for _, size, path in entries:
+            if self._size <= self.max_bytes * self.LOW_WATER:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+
+response_cache = ResponseCache(LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES)
+journal = JobJournal(JOURNAL_DIR)
+# youtube_transcript_api takes no timeout, so its calls run under a watchdog
+transcript_service = ServiceClient(
+    "transcripts",
+    TRANSCRIPT_CALLS_PER_SECOND,
+    TRANSCRIPT_TIMEOUT_SECONDS,
+    watchdog=True,
+)
+llm_service = ServiceClient("gemini", LLM_CALLS_PER_SECOND, LLM_TIMEOUT_SECONDS)
+playlist_service = ServiceClient("youtube-data", 0, PLAYLIST_TIMEOUT_SECONDS)
+
+# Connection pool sized for every video thread to keep its connection alive
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_maxsize=max(VIDEOS_IN_FLIGHT, 1)))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Gemini client, created on first use so the module imports without keys"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            google_ai_api_key = os.getenv("GOOGLE_AI_API_KEY")
+            if not google_ai_api_key:
+                raise ValueError("GOOGLE_AI_API_KEY environment variable is required")
+            _client = genai.Client(
+                api_key=google_ai_api_key,
+                http_options={"timeout": int(llm_service.timeout * 1000)},
+            )
+        return _client
 
 
 def fetch_transcript(video_id: str, lang="tr") -> str:
+    """Transcript text of one video, "" if it has none
+
+    The journal keeps the fetched transcript, so this always asks YouTube.
+    """
     try:
-        transcript_path = os.path.join("transcripts", f"{video_id}.txt")
-        if os.path.exists(transcript_path):
-            print(f"Transcript already exists: {transcript_path}")
-            with open(transcript_path, "r", encoding="utf-8") as f:
-                return f.read()
-
-        data = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang, "en"])
-        transcript = " ".join([d["text"] for d in data])
-
-        os.makedirs("transcripts", exist_ok=True)
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
-        print(f"Transcript saved to {transcript_path}")
-        return transcript
+        data = transcript_service.call(
+            YouTubeTranscriptApi.get_transcript, video_id, languages=[lang, "en"]
+        )
+        return " ".join([d["text"] for d in data])
     except Exception as e:
         print(f"[Transcript hata] {video_id}: {e}")
         return ""
@@ -71,45 +542,235 @@ Sorularda \"A)\", \"B)\", \"C)\", \"D)\" şeklinde şıkları ayır. Joker kulla
 """
 
 
-def parse_chunk(chunk: str):
+def parse_chunk(chunk: str, llm_client=None):
+    # Same model, prompt and chunk give the same answer: only pay for it once
+    key = response_cache.key(MODEL, PROMPT, chunk)
+    out = response_cache.get(key)
+    if out is not None:
+        return out
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
+    llm_client = llm_client or get_client()
+    response = llm_service.call(
+        llm_client.models.generate_content,
+        model=MODEL,
         contents=PROMPT + "\n\n" + chunk,
     )
-    return response.text.strip()
-
+    out = response.text.strip()
+    # An empty, truncated or non-JSON reply is returned but not kept, so a
+    # rerun asks the model again instead of reusing it forever
+    if parse_json_entries(out):
+        response_cache.put(key, out)
+    return out
+
+
+def contestant_intro(text, position, max_chars=CONTESTANT_INTRO_CHARS):
+    """Introduction of the contestant playing at ``position``, "" if unknown
+
+    The text from the last contestant boundary before ``position`` up to its
+    first question, at most ``max_chars`` and never past ``position``.
+    """
+    intros = [m.start() for m in CONTESTANT_BOUNDARY.finditer(text, 0, position)]
+    if not intros:
+        return ""
+    start = intros[-1]
+    end = min(start + max_chars, position)
+    question = QUESTION_BOUNDARY.search(text, start + 1, end)
+    if question:
+        end = question.start()
+    elif end < position:
+        # Cut on a word boundary rather than mid-name
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+    return text[start:end].strip()
+
+
+def chunk_transcript(text, max_chars=CHUNK_CHARS, overlap=CHUNK_OVERLAP_CHARS):
+    """Split ``text`` into chunks of at most ``max_chars``
+
+    A chunk ends right before the last question or contestant boundary in
+    its second half, or at the last space if there is none. A later chunk
+    opens with the introduction of the contestant playing where it starts,
+    so the model can tell whose questions they are. After a boundary it
+    starts right at the boundary, as every question is whole in one chunk;
+    otherwise, or when no introduction is found, it starts ``overlap``
+    characters earlier so nothing cut at the edge is lost, and
+    merge_chunk_outputs() drops the repeats.
+    """
+    chunks = []
+    start = 0
+    intro = ""
+    max_intro = min(CONTESTANT_INTRO_CHARS, max_chars // 4)
+    while len(intro) + len(text) - start > max_chars:
+        room = max_chars - len(intro)
+        window = text[start : start + room]
+        boundaries = [m.start() for m in SEGMENT_BOUNDARY.finditer(window, room // 2)]
+        if boundaries:
+            end = start + boundaries[-1]
+        else:
+            space = window.rfind(" ", room // 2)
+            end = start + (space if space != -1 else room)
+        chunks.append(f"{intro} {text[start:end]}".strip())
 
-def process_video(video_url: str):
-    import json
+        next_intro = contestant_intro(text, end, max_intro)
+        if boundaries and (next_intro or CONTESTANT_BOUNDARY.match(text, end)):
+            start = end
+        else:
+            # Begin the next chunk on a word boundary inside the overlap
+            next_start = max(end - overlap, start + 1)
+            space = text.find(" ", next_start, end)
+            start = space + 1 if space != -1 else next_start
+            next_intro = contestant_intro(text, start, max_intro)
+        # A chunk starting on an introduction needs no copy of the previous one
+        intro = "" if CONTESTANT_BOUNDARY.match(text, start) else next_intro
+    chunks.append(f"{intro} {text[start:]}".strip())
+    return chunks
+
+
+def parse_chunks(chunks, llm_client=None):
+    """LLM outputs for ``chunks``, extracted concurrently and returned in order"""
+    if len(chunks) == 1:
+        return [parse_chunk(chunks[0], llm_client)]
+    with ThreadPoolExecutor(max_workers=min(CHUNKS_IN_FLIGHT, len(chunks))) as pool:
+        return list(pool.map(lambda chunk: parse_chunk(chunk, llm_client), chunks))
+
+
+def parse_json_entries(out):
+    """Entries of one LLM output, recovering the outermost list if needed"""
+    try:
+        data = json.loads(out)
+    except json.JSONDecodeError:
+        start_index = out.find("[")
+        end_index = out.rfind("]") + 1
+        try:
+            data = json.loads(out[start_index:end_index])
+        except json.JSONDecodeError as e:
+            print(f"JSON parse error in chunk output: {e}")
+            return []
+    if isinstance(data, dict):
+        data = [data]
+    return [entry for entry in data if isinstance(entry, dict)]
 
-    vid = re.search(r"v=([\w\-]+)", video_url).group(1)
 
-    # Check if raw output already exists
-    raw_output_path = f"raw_output/debug_raw_output_{vid}.txt"
-    if os.path.exists(raw_output_path):
-        print(f"Raw output already exists for video {vid}, loading from file...")
-        with open(raw_output_path, "r", encoding="utf-8") as f:
-            out = f.read()
-    else:
-        text = fetch_transcript(vid)
+def question_level(value):
+    """Level of a question as a positive int, None if unknown"""
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        return None
+    return level if level > 0 else None
+
+
+def merge_chunk_outputs(outputs):
+    """One entry list from chunk outputs, without questions repeated by overlap
+
+    A question is a repeat if the same contestant already has the same
+    question text or the same known level. A chunk may hold only part of a
+    question cut at its edge, so of two copies the one with an answer and
+    the longer text is kept, in the place of the first.
+    """
+    merged = []
+    # Key of every kept question -> [list holding it, index, completeness]
+    kept = {}
+
+    def completeness(question):
+        return (
+            bool(str(question.get("contestant_answer") or "").strip()),
+            len(" ".join(str(question.get("question") or "").split())),
+        )
 
-        # Skip if transcript is empty
+    def keep(contestant, question, container):
+        """Add ``question`` to ``container`` unless a copy is kept already"""
+        text = question.get("question", "")
         if not text:
-            return []
+            container.append(question)
+            return
+        contestant = " ".join(str(contestant or "").lower().split())
+        keys = [("question", contestant, " ".join(str(text).lower().split()))]
+        level = question_level(question.get("level"))
+        if level is not None:
+            keys.append(("level", contestant, level))
+
+        slot = next((kept[key] for key in keys if key in kept), None)
+        if slot is None:
+            container.append(question)
+            slot = [container, len(container) - 1, completeness(question)]
+        elif completeness(question) > slot[2]:
+            slot[0][slot[1]] = question
+            slot[2] = completeness(question)
+        for key in keys:
+            kept.setdefault(key, slot)
+
+    for out in outputs:
+        for entry in parse_json_entries(out):
+            contestant = entry.get("contestant", "")
+            if "questions_answered" in entry:
+                questions = []
+                for question in entry.get("questions_answered", []):
+                    keep(contestant, question, questions)
+                if questions:
+                    merged.append({**entry, "questions_answered": questions})
+            else:
+                keep(contestant, entry, merged)
 
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=PROMPT + "\n\n" + text,
-        )
+    return merged
 
-        out = response.text.strip()
 
-        # Save raw output for future use
-        os.makedirs("raw_output", exist_ok=True)
-        with open(raw_output_path, "w", encoding="utf-8") as f:
-            f.write(out)
+def raw_output_path(vid):
+    return os.path.join("raw_output", f"debug_raw_output_{vid}.txt")
+
+
+def video_csv_paths(vid):
+    """Detailed and stats CSV of one video"""
+    return (
+        os.path.join("csv", f"{vid}.csv"),
+        os.path.join("csv", f"{vid}_stats.csv"),
+    )
+
+
+def extraction_key():
+    """Hash of the settings that shape model output for a transcript
+
+    Journal stages from "extracted" on are recorded with it, so changing the
+    model, prompt or chunking makes them stale.
+    """
+    settings = [
+        MODEL,
+        PROMPT,
+        str(CHUNK_CHARS),
+        str(CHUNK_OVERLAP_CHARS),
+        str(CONTESTANT_INTRO_CHARS),
+    ]
+    return hashlib.sha256("\0".join(settings).encode("utf-8")).hexdigest()[:16]
+
 
+def is_ingested(vid, extraction):
+    """Whether ``vid`` was written under ``extraction`` and its CSVs still exist"""
+    return journal.done(vid, "written", extraction) and all(
+        os.path.exists(path) for path in video_csv_paths(vid)
+    )
+
+
+def extract_video(vid, text, llm_client=None):
+    """Model output for one transcript, also kept in raw_output/
+
+    Responses are cached per chunk, so only chunks whose model, prompt or
+    transcript text changed are sent to the model again.
+    """
+    chunks = chunk_transcript(text)
+    if len(chunks) == 1:
+        out = parse_chunk(text, llm_client)
+    else:
+        print(f"Extracting video {vid} in {len(chunks)} chunks...")
+        outputs = parse_chunks(chunks, llm_client)
+        out = json.dumps(merge_chunk_outputs(outputs), ensure_ascii=False)
+
+    # Keep the raw output for process_raw_output.py and debugging
+    write_text(raw_output_path(vid), out)
+    return out
+
+
+def parse_video_output(vid, out):
+    """Rows for one video from its model output"""
     try:
         # Attempt to parse the JSON output
         data = json.loads(out)
@@ -201,132 +862,200 @@ def clean_with(df):
     return df
 
 
+def get_json(url, params):
+    """GET ``url`` on the pooled session; HTTP errors raise so 429/5xx retry"""
+    response = http_session.get(url, params=params, timeout=playlist_service.timeout)
+    response.raise_for_status()
+    return response.json()
+
+
 def get_video_ids_from_playlist(playlist_id, api_key):
-    url = f"https://www.googleapis.com/youtube/v3/playlistItems?part=contentDetails&playlistId={playlist_id}&maxResults=50&key={api_key}"
+    url = "https://www.googleapis.com/youtube/v3/playlistItems"
+    params = {
+        "part": "contentDetails",
+        "playlistId": playlist_id,
+        "maxResults": 50,
+        "key": api_key,
+    }
     video_ids = []
-    while url:
-        response = requests.get(url).json()
+    while True:
+        response = playlist_service.call(get_json, url, params)
         for item in response.get("items", []):
             video_ids.append(item["contentDetails"]["videoId"])
         next_page_token = response.get("nextPageToken")
-        if next_page_token:
-            url = f"https://www.googleapis.com/youtube/v3/playlistItems?part=contentDetails&playlistId={playlist_id}&maxResults=50&pageToken={next_page_token}&key={api_key}"
-        else:
-            url = None
-    return video_ids
+        if not next_page_token:
+            return video_ids
+        params["pageToken"] = next_page_token
+
+
+def ingest_video(i, total, url, llm_client=None, fetch=fetch_transcript):
+    """Extract, clean and save one video; return its raw rows
+
+    Stages already recorded in the journal under the current
+    extraction_key() are not redone: a written video whose CSVs still exist
+    only has its parsed rows loaded for the combined CSVs, and a cleaned one
+    only has its stats CSV written. Otherwise the journaled transcript is
+    extracted again, which costs no model calls for chunks already in the
+    response cache.
+    """
+    print(f"\nProcessing video {i}/{total}: {url}")
+    video_start = time.time()
+    rows = []
+    vid = None
 
+    try:
+        vid = re.search(r"v=([\w\-]+)", url).group(1)
+        csv_path, stats_path = video_csv_paths(vid)
+        extraction = extraction_key()
 
-def main(video_urls):
-    import time
+        if is_ingested(vid, extraction):
+            print(f"Video {vid} already ingested")
+            return journal.load_rows(vid)
 
-    os.makedirs("csv", exist_ok=True)
+        if journal.done(vid, "parsed", extraction):
+            rows = journal.load_rows(vid)
+        else:
+            if journal.done(vid, "fetched"):
+                text = journal.load_transcript(vid)
+            else:
+                text = fetch(vid)
+                if not text:
+                    print(f"No transcript for video {vid}!")
+                    journal.record(vid, url, error="empty transcript")
+                    return []
+                journal.save_transcript(vid, text)
+                journal.record(vid, url, "fetched")
+
+            out = extract_video(vid, text, llm_client)
+            journal.record(vid, url, "extracted", extraction=extraction)
+            rows = parse_video_output(vid, out)
+            journal.save_rows(vid, rows)
+            journal.record(vid, url, "parsed", extraction=extraction)
+
+        if not rows:
+            print(f"No data extracted from video {vid}!")
+            journal.record(vid, url, error="no rows extracted")
+            return []  # Create DataFrame for this video
+        df_video = pd.DataFrame(rows)
+        print(f"DEBUG: DataFrame created with {len(df_video)} rows")
+        if len(df_video) > 0:
+            print(
+                f"DEBUG: Video ID column sample: {df_video['video_id'].head().tolist()}"
+            )
 
-    print(f"Starting processing of {len(video_urls)} video(s)...")
-    start_time = time.time()
+        # Kolonları yeniden sırala
+        expected_columns = [
+            "video_id",
+            "contestant",
+            "question",
+            "options",
+            "correct_answer",
+            "contestant_answer",
+            "category",
+            "level",
+            "amount",
+            "joker_used",
+            "is_correct",
+            "eliminated",
+        ]
+
+        # Add missing columns
+        for col in expected_columns:
+            if col not in df_video.columns:
+                df_video[col] = None
+                print(f"DEBUG: Added missing column: {col}")
+
+        df_video = df_video[expected_columns]
+        print(
+            f"DEBUG: After column reordering, video_id sample: {df_video['video_id'].head().tolist()}"
+        )
 
-    all_rows = []
-    for i, url in enumerate(video_urls, 1):
-        print(f"\nProcessing video {i}/{len(video_urls)}: {url}")
-        video_start = time.time()
+        # Veri temizleme for this video
+        df_video = clean_with(df_video)
+        print(
+            f"DEBUG: After cleaning, video_id sample: {df_video['video_id'].head().tolist()}"
+        )
 
-        try:
-            vid = re.search(r"v=([\w\-]+)", url).group(1)
-            csv_path = os.path.join("csv", f"{vid}.csv")
-            stats_path = os.path.join("csv", f"{vid}_stats.csv")
+        # Save detailed data for this video, unless a resumed run already did
+        if journal.done(vid, "cleaned", extraction) and os.path.exists(csv_path):
+            print(f"Video CSV already saved: {csv_path}")
+        else:
+            write_csv(df_video, csv_path)
+            journal.record(vid, url, "cleaned", extraction=extraction)
+            print(f"Video CSV saved: {csv_path}")
 
-            if os.path.exists(csv_path) and os.path.exists(stats_path):
-                print(f"CSV files already exist for video {vid}")
-                continue
+        # Generate contestant stats for this video
+        if len(df_video) > 0:
+            contestant_stats_video = (
+                df_video.groupby(["video_id", "contestant"], as_index=False)
+                .agg(
+                    {
+                        "question": "count",  # Toplam soru sayısı
+                        "is_correct": "sum",  # Doğru cevap sayısı
+                        "amount": "max",  # Ulaştığı en yüksek miktar
+                        "eliminated": "max",  # Elendi mi
+                        "level": "max",  # Ulaştığı en yüksek seviye
+                    }
+                )
+                .rename(
+                    columns={
+                        "question": "total_questions",
+                        "is_correct": "correct_answers",
+                        "amount": "max_amount",
+                        "level": "max_level",
+                    }
+                )
+            )
 
-            rows = process_video(url)
-            all_rows.extend(rows)
+            # Save contestant stats for this video
+            write_csv(contestant_stats_video, stats_path)
+            print(f"Video stats CSV saved: {stats_path}")
+        journal.record(vid, url, "written", extraction=extraction)
 
-            if not rows:
-                print(f"No data extracted from video {vid}!")
-                continue  # Create DataFrame for this video
-            df_video = pd.DataFrame(rows)
-            print(f"DEBUG: DataFrame created with {len(df_video)} rows")
-            if len(df_video) > 0:
-                print(
-                    f"DEBUG: Video ID column sample: {df_video['video_id'].head().tolist()}"
-                )
+        video_duration = time.time() - video_start
+        print(
+            f"Video {i} completed in {video_duration:.1f}s, extracted {len(rows)} entries"
+        )
 
-            # Kolonları yeniden sırala
-            expected_columns = [
-                "video_id",
-                "contestant",
-                "question",
-                "options",
-                "correct_answer",
-                "contestant_answer",
-                "category",
-                "level",
-                "amount",
-                "joker_used",
-                "is_correct",
-                "eliminated",
-            ]
-
-            # Add missing columns
-            for col in expected_columns:
-                if col not in df_video.columns:
-                    df_video[col] = None
-                    print(f"DEBUG: Added missing column: {col}")
-
-            df_video = df_video[expected_columns]
-            print(
-                f"DEBUG: After column reordering, video_id sample: {df_video['video_id'].head().tolist()}"
-            )
+        return rows
 
-            # Veri temizleme for this video
-            df_video = clean_with(df_video)
-            print(
-                f"DEBUG: After cleaning, video_id sample: {df_video['video_id'].head().tolist()}"
-            )
+    except Exception as e:
+        print(f"Error processing video {i}: {e}")
+        if vid is not None:
+            journal.record(vid, url, error=f"{type(e).__name__}: {e}")
+        return rows
 
-            # Save detailed data for this video
-            df_video.to_csv(csv_path, index=False, quoting=csv.QUOTE_NONNUMERIC)
-            print(f"Video CSV saved: {csv_path}")
 
-            # Generate contestant stats for this video
-            if len(df_video) > 0:
-                contestant_stats_video = (
-                    df_video.groupby(["video_id", "contestant"], as_index=False)
-                    .agg(
-                        {
-                            "question": "count",  # Toplam soru sayısı
-                            "is_correct": "sum",  # Doğru cevap sayısı
-                            "amount": "max",  # Ulaştığı en yüksek miktar
-                            "eliminated": "max",  # Elendi mi
-                            "level": "max",  # Ulaştığı en yüksek seviye
-                        }
-                    )
-                    .rename(
-                        columns={
-                            "question": "total_questions",
-                            "is_correct": "correct_answers",
-                            "amount": "max_amount",
-                            "level": "max_level",
-                        }
-                    )
-                )
+def main(
+    video_urls,
+    videos_in_flight=VIDEOS_IN_FLIGHT,
+    llm_client=None,
+    fetch=fetch_transcript,
+):
+    os.makedirs("csv", exist_ok=True)
 
-                # Save contestant stats for this video
-                contestant_stats_video.to_csv(
-                    stats_path,
-                    index=False,
-                    quoting=csv.QUOTE_NONNUMERIC,
-                )
-                print(f"Video stats CSV saved: {stats_path}")
+    print(f"Starting processing of {len(video_urls)} video(s)...")
+    start_time = time.time()
 
-            video_duration = time.time() - video_start
-            print(
-                f"Video {i} completed in {video_duration:.1f}s, extracted {len(rows)} entries"
-            )
+    # Remember the whole run so `resume` can finish and recombine it
+    journal.save_run(video_urls)
 
-        except Exception as e:
-            print(f"Error processing video {i}: {e}")
-            continue
+    def ingest(numbered_url):
+        i, url = numbered_url
+        return ingest_video(i, len(video_urls), url, llm_client, fetch)
+
+    # Videos run concurrently, but rows are combined in playlist order so the
+    # combined CSVs do not depend on which video finished first
+    numbered_urls = list(enumerate(video_urls, 1))
+    if videos_in_flight > 1:
+        with ThreadPoolExecutor(max_workers=videos_in_flight) as pool:
+            results = list(pool.map(ingest, numbered_urls))
+    else:
+        results = [ingest(numbered_url) for numbered_url in numbered_urls]
+
+    all_rows = []
+    for rows in results:
+        all_rows.extend(rows)
 
     if not all_rows:
         print("No data extracted from any video!")
@@ -386,24 +1115,60 @@ def main(video_urls):
         )
 
         # Ana veriyi kaydet (combined)
-        df_all.to_csv(
-            "csv/milyoner_data_all.csv", index=False, quoting=csv.QUOTE_NONNUMERIC
-        )
+        write_csv(df_all, "csv/milyoner_data_all.csv")
         print(f"Combined CSV oluşturuldu: {len(df_all)} satır.")
 
         # Yarışmacı özetini kaydet (combined)
-        contestant_stats_all.to_csv(
-            "csv/milyoner_contestant_stats_all.csv",
-            index=False,
-            quoting=csv.QUOTE_NONNUMERIC,
-        )
+        write_csv(contestant_stats_all, "csv/milyoner_contestant_stats_all.csv")
         print(f"Combined stats CSV oluşturuldu: {len(contestant_stats_all)} satır.")
 
     total_duration = time.time() - start_time
     print(f"\nTotal processing time: {total_duration:.1f}s")
 
 
+def resume(videos_in_flight=VIDEOS_IN_FLIGHT, llm_client=None, fetch=fetch_transcript):
+    """Re-run the last run, redoing only the unfinished stages of each video"""
+    video_urls = journal.load_run()
+    if video_urls is None:
+        print(f"No run recorded in {JOURNAL_DIR}/; start one with the run command")
+        return
+
+    extraction = extraction_key()
+    unfinished = []
+    for url in video_urls:
+        vid = re.search(r"v=([\w\-]+)", url).group(1)
+        if not is_ingested(vid, extraction):
+            unfinished.append(journal.get(vid))
+
+    print(f"{len(unfinished)} of {len(video_urls)} video(s) unfinished")
+    for entry in unfinished:
+        error = f" ({entry['error']})" if entry["error"] else ""
+        print(f"  {entry['video_id']}: {entry['stage'] or 'not started'}{error}")
+
+    # Finished videos only load their rows, keeping the combined CSVs complete
+    main(video_urls, videos_in_flight, llm_client, fetch)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Extract Milyoner question data from a YouTube playlist"
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "resume"],
+        default="run",
+        help="run: ingest the playlist; resume: finish the journaled videos",
+    )
+    args = parser.parse_args()
+
+    if args.command == "resume":
+        resume()
+        raise SystemExit
+
+    if not api_key:
+        raise ValueError("YOUTUBE_API_KEY environment variable is required")
+
     # Fetch video IDs from the playlist
     video_ids = get_video_ids_from_playlist(playlist_id, api_key)
 
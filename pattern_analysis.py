@@ -1,77 +1,1221 @@
 import pandas as pd
 import numpy as np
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, namedtuple
 import json
+import multiprocessing
+import os
+import pickle
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from multiprocessing import shared_memory
+
+# Choice code for a question without a recorded contestant answer
+MISSING_CHOICE = -1
+
+# Sections of generate_comprehensive_report(), in report order
+REPORT_SECTIONS = [
+    "summary_statistics",
+    "performance_clusters",
+    "transition_matrices",
+    "first_choice_patterns",
+    "sequential_patterns",
+    "deep_sequential_patterns",
+    "correct_wrong_patterns",
+    "level_based_patterns",
+    "winning_patterns",
+]
+
+
+def _smallest_int_dtype(size):
+    """Signed integer dtype able to hold codes 0..size-1 and MISSING_CHOICE"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class EncodedSequences:
+    """Contestant sequences as flat arrays with per-contestant offsets
+
+    Contestant ``i`` owns positions ``offsets[i]:offsets[i + 1]`` of every
+    per-question array. Choices are small integer codes into
+    ``choice_labels`` with MISSING_CHOICE for NaN, so n-grams can be
+    enumerated and counted as integer arrays instead of Python tuples.
+    """
+
+    def __init__(self, contestants, counts, ordered):
+        self.contestants = np.asarray(contestants, dtype=object)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        codes, labels = pd.factorize(ordered["contestant_answer"])
+        self.choice_labels = labels.tolist()
+        self.choices = codes.astype(_smallest_int_dtype(len(labels)))
+        self.is_correct = ordered["is_correct"].to_numpy(dtype=bool)
+        self.levels = ordered["level"].to_numpy()
+        category_codes, category_labels = pd.factorize(
+            ordered["category"], use_na_sentinel=False
+        )
+        self.categories = category_codes
+        self.category_labels = category_labels.tolist()
 
+        # Per-contestant outcome
+        starts = self.offsets[:-1]
+        self.eliminated = np.logical_or.reduceat(
+            ordered["eliminated"].to_numpy(dtype=bool), starts
+        )
+        self.final_levels = np.maximum.reduceat(self.levels, starts)
+        self._index_positions()
+
+    def _index_positions(self):
+        # Owner contestant and end of its sequence for every position
+        counts = np.diff(self.offsets)
+        self.owners = np.repeat(np.arange(len(counts)), counts)
+        self.sequence_ends = self.offsets[1:][self.owners]
+        self._correct_cumsum = np.concatenate(
+            [[0], np.cumsum(self.is_correct, dtype=np.int64)]
+        )
+        self._missing_cumsum = np.concatenate(
+            [[0], np.cumsum(self.choices == MISSING_CHOICE, dtype=np.int64)]
+        )
 
-class ContestantPatternAnalyzer:
-    def __init__(self, csv_file):
-        self.df = pd.read_csv(csv_file)
-        self.contestant_sequences = self._build_contestant_sequences()
-        self.transition_matrices = self._build_transition_matrices()
-        self.performance_clusters = self._analyze_performance_clusters()
-
-    def _build_contestant_sequences(self):
-        """Build sequences of choices for each contestant"""
-        sequences = {}
+    def extend(self, other):
+        """Append the sequences of ``other``, whose contestants must all be new"""
+        choice_codes = _merge_labels(self.choice_labels, other.choice_labels)
+        category_codes = _merge_labels(self.category_labels, other.category_labels)
+        # MISSING_CHOICE (-1) picks the appended sentinel and stays missing
+        other_choices = np.append(choice_codes, MISSING_CHOICE)[other.choices]
 
-        for contestant in self.df["contestant"].unique():
-            contestant_data = self.df[self.df["contestant"] == contestant].sort_values(
-                "level"
+        self.contestants = np.concatenate([self.contestants, other.contestants])
+        self.offsets = np.concatenate(
+            [self.offsets, other.offsets[1:] + self.offsets[-1]]
+        )
+        self.choices = np.concatenate([self.choices, other_choices]).astype(
+            _smallest_int_dtype(len(self.choice_labels))
+        )
+        self.is_correct = np.concatenate([self.is_correct, other.is_correct])
+        self.levels = np.concatenate([self.levels, other.levels])
+        self.categories = np.concatenate(
+            [self.categories, category_codes[other.categories]]
+        )
+        self.eliminated = np.concatenate([self.eliminated, other.eliminated])
+        self.final_levels = np.concatenate([self.final_levels, other.final_levels])
+        self._index_positions()
+
+    def window_labels(self, starts, length):
+        """Tuple of choice labels for each window"""
+        labels = self.choice_labels
+        return [
+            tuple(labels[code] for code in self.choices[start : start + length])
+            for start in starts
+        ]
+
+    def window_values(self, values, starts, length):
+        """``values`` at every position of each window, flattened window by window"""
+        return values[(starts[:, None] + np.arange(length)).reshape(-1)]
+
+    def correct_counts(self, starts, length):
+        """Number of correct answers inside each window"""
+        return self._correct_cumsum[starts + length] - self._correct_cumsum[starts]
+
+    def next_choices(self, starts, length):
+        """Choice code right after each window, MISSING_CHOICE if there is none"""
+        following = starts + length
+        has_next = following < self.sequence_ends[starts]
+        result = np.full(len(starts), MISSING_CHOICE, dtype=np.int64)
+        result[has_next] = self.choices[following[has_next]]
+        return result
+
+    def ends_sequence(self, starts, length):
+        """Whether each window reaches the end of its contestant's sequence"""
+        return starts + length >= self.sequence_ends[starts]
+
+
+NGramPatterns = namedtuple(
+    "NGramPatterns",
+    ["starts", "groups", "first", "occurrences", "success", "eliminations"],
+)
+
+
+class NGramIndex:
+    """Every window of answered choices, grown one length at a time like a trie
+
+    Windows of length L are stored as their start positions, in sequence
+    order, and a node id shared by all windows holding the same choices.
+    Length L + 1 extends the surviving length-L windows by one choice, so
+    every window is visited once per extra position rather than rescanning
+    the sequences for each length. Node ids are numbered in order of first
+    occurrence and double as pattern numbers.
+
+    Per-pattern aggregates are memoized per length and shared by all
+    pattern methods. extend() adds the windows of newly appended sequences
+    and folds only those into every memoized aggregate.
+    """
+
+    # Bits of a child node key holding the choice code, below the parent id
+    CHOICE_BITS = 32
+
+    def __init__(self, encoded):
+        self.encoded = encoded
+        # Per length: (start positions, node ids) of the windows, and the
+        # (sorted child keys, node id of each key) table numbering them
+        self._windows = []
+        self._nodes = []
+        self._patterns = {}
+        self._labels = {}
+        self._next_choices = {}
+        self._contestants = {}
+        self._distributions = {}
+
+    def _node_ids(self, length, keys):
+        """Node ids of child ``keys`` at ``length``, numbering unseen keys in order"""
+        if len(self._nodes) < length:
+            empty = np.empty(0, dtype=np.int64)
+            self._nodes.append((empty, empty))
+        sorted_keys, sorted_ids = self._nodes[length - 1]
+
+        ids = np.empty(len(keys), dtype=np.int64)
+        found = np.zeros(len(keys), dtype=bool)
+        if len(sorted_keys):
+            positions = np.searchsorted(sorted_keys, keys)
+            positions = np.minimum(positions, len(sorted_keys) - 1)
+            found = sorted_keys[positions] == keys
+            ids[found] = sorted_ids[positions[found]]
+
+        if not found.all():
+            unique, first, inverse = np.unique(
+                keys[~found], return_index=True, return_inverse=True
+            )
+            rank = np.empty(len(unique), dtype=np.int64)
+            rank[np.argsort(first, kind="stable")] = np.arange(len(unique))
+            new_ids = len(sorted_keys) + rank
+            ids[~found] = new_ids[inverse.reshape(-1)]
+            insert_at = np.searchsorted(sorted_keys, unique)
+            self._nodes[length - 1] = (
+                np.insert(sorted_keys, insert_at, unique),
+                np.insert(sorted_ids, insert_at, new_ids),
+            )
+        return ids
+
+    def _first_windows(self, start):
+        """Windows of one answered choice at or after position ``start``"""
+        choices = self.encoded.choices
+        starts = np.flatnonzero(choices[start:] != MISSING_CHOICE) + start
+        return starts, self._node_ids(1, choices[starts].astype(np.int64))
+
+    def _longer_windows(self, starts, nodes, length):
+        """Extend windows of ``length`` choices by the choice that follows them"""
+        encoded = self.encoded
+        following = starts + length
+        keep = following < encoded.sequence_ends[starts]
+        keep[keep] = encoded.choices[following[keep]] != MISSING_CHOICE
+        choices = encoded.choices[following[keep]].astype(np.int64)
+        keys = (nodes[keep] << self.CHOICE_BITS) | choices
+        return starts[keep], self._node_ids(length + 1, keys)
+
+    def windows(self, length):
+        """Start positions and node ids of all complete windows of ``length``"""
+        if not self._windows:
+            self._windows.append(self._first_windows(0))
+        while len(self._windows) < length:
+            starts, nodes = self._windows[-1]
+            self._windows.append(
+                self._longer_windows(starts, nodes, len(self._windows))
+            )
+        return self._windows[length - 1]
+
+    def extend(self, start):
+        """Index the sequences appended to ``encoded`` from position ``start`` on
+
+        Sequences before ``start`` must be unchanged. Only the new windows
+        are built and folded into the memoized aggregates.
+        """
+        if not self._windows:
+            return
+
+        new_windows = [self._first_windows(start)]
+        while len(new_windows) < len(self._windows):
+            starts, nodes = new_windows[-1]
+            new_windows.append(self._longer_windows(starts, nodes, len(new_windows)))
+
+        for length, (starts, nodes) in enumerate(new_windows, 1):
+            old_starts, old_nodes = self._windows[length - 1]
+            self._windows[length - 1] = (
+                np.concatenate([old_starts, starts]),
+                np.concatenate([old_nodes, nodes]),
             )
+            if length not in self._patterns:
+                continue
+
+            old = self._patterns[length]
+            self._patterns[length] = self._count_patterns(starts, nodes, length, old)
+            if length in self._labels:
+                first = self._patterns[length].first[len(old.first) :]
+                self._labels[length].extend(
+                    self.encoded.window_labels(
+                        self._patterns[length].starts[first], length
+                    )
+                )
+            if length in self._next_choices:
+                self._add_next_choices(
+                    self._next_choices[length], starts, nodes, length
+                )
+            if length in self._contestants:
+                self._add_contestants(self._contestants[length], starts, nodes, length)
+            for field in ("levels", "categories"):
+                if (length, field) in self._distributions:
+                    self._add_distribution(
+                        self._distributions[(length, field)],
+                        starts,
+                        nodes,
+                        length,
+                        field,
+                    )
 
-            sequences[contestant] = {
-                "choices": contestant_data["contestant_answer"].tolist(),
-                "correct": contestant_data["correct_answer"].tolist(),
-                "is_correct": contestant_data["is_correct"].tolist(),
-                "levels": contestant_data["level"].tolist(),
-                "categories": contestant_data["category"].tolist(),
-                "eliminated": contestant_data["eliminated"].any(),
-                "final_level": contestant_data["level"].max(),
-            }
+    def _count_patterns(self, starts, groups, length, previous=None):
+        """NGramPatterns of the given windows, added to ``previous`` if given"""
+        encoded = self.encoded
+        if previous is None:
+            previous = NGramPatterns(
+                starts=np.empty(0, dtype=np.int64),
+                groups=np.empty(0, dtype=np.int64),
+                first=np.empty(0, dtype=np.int64),
+                occurrences=np.empty(0, dtype=np.int64),
+                success=np.empty(0, dtype=np.float64),
+                eliminations=np.empty(0, dtype=np.int64),
+            )
+        n_previous = len(previous.first)
+        n_patterns = max(n_previous, int(groups.max()) + 1 if len(groups) else 0)
+
+        def resized(values):
+            result = np.zeros(n_patterns, dtype=values.dtype)
+            result[:n_previous] = values
+            return result
+
+        # Groups are numbered by first occurrence, so new ones start here
+        first = resized(previous.first)
+        new_groups, new_first = np.unique(groups, return_index=True)
+        is_new = new_groups >= n_previous
+        first[new_groups[is_new]] = new_first[is_new] + len(previous.starts)
 
-        return sequences
+        fractions = encoded.correct_counts(starts, length) / length
+        # Eliminated contestants whose sequence ends with this window
+        eliminated = encoded.eliminated[encoded.owners[starts]] & encoded.ends_sequence(
+            starts, length
+        )
 
-    def _build_transition_matrices(self):
-        """Build transition matrices for choice patterns"""
-        matrices = {
-            "choice_to_choice": defaultdict(lambda: defaultdict(int)),
-            "correct_wrong_transitions": defaultdict(lambda: defaultdict(int)),
-            "level_transitions": defaultdict(lambda: defaultdict(int)),
-            "category_transitions": defaultdict(lambda: defaultdict(int)),
+        return NGramPatterns(
+            starts=np.concatenate([previous.starts, starts]),
+            groups=np.concatenate([previous.groups, groups]),
+            first=first,
+            occurrences=resized(previous.occurrences)
+            + np.bincount(groups, minlength=n_patterns),
+            success=_grouped_sums(groups, fractions, resized(previous.success)),
+            eliminations=resized(previous.eliminations)
+            + np.bincount(groups[eliminated], minlength=n_patterns),
+        )
+
+    def patterns(self, length):
+        """Occurrence, success and elimination totals per pattern of ``length``
+
+        Patterns are numbered in order of first occurrence.
+        """
+        if length not in self._patterns:
+            starts, nodes = self.windows(length)
+            self._patterns[length] = self._count_patterns(starts, nodes, length)
+        return self._patterns[length]
+
+    def labels(self, length):
+        """Choice labels of every pattern of ``length``"""
+        if length not in self._labels:
+            patterns = self.patterns(length)
+            self._labels[length] = self.encoded.window_labels(
+                patterns.starts[patterns.first], length
+            )
+        return self._labels[length]
+
+    def _add_next_choices(self, counters, starts, groups, length):
+        encoded = self.encoded
+        next_codes = encoded.next_choices(starts, length)
+        has_next = next_codes != MISSING_CHOICE
+        _add_grouped_counts(
+            counters,
+            groups[has_next],
+            next_codes[has_next],
+            len(self.patterns(length).first),
+            lambda code: encoded.choice_labels[code],
+        )
+
+    def next_choices(self, length):
+        """Counter of the choice following each pattern of ``length``"""
+        if length not in self._next_choices:
+            patterns = self.patterns(length)
+            counters = []
+            self._add_next_choices(counters, patterns.starts, patterns.groups, length)
+            self._next_choices[length] = counters
+        return self._next_choices[length]
+
+    def _add_contestants(self, lists, starts, groups, length):
+        encoded = self.encoded
+        _add_grouped_lists(
+            lists,
+            groups,
+            encoded.contestants[encoded.owners[starts]],
+            len(self.patterns(length).first),
+        )
+
+    def contestants(self, length):
+        """Contestant of every occurrence of each pattern of ``length``"""
+        if length not in self._contestants:
+            patterns = self.patterns(length)
+            lists = []
+            self._add_contestants(lists, patterns.starts, patterns.groups, length)
+            self._contestants[length] = lists
+        return self._contestants[length]
+
+    def _add_distribution(self, counters, starts, groups, length, field):
+        encoded = self.encoded
+        if field == "levels":
+            values = encoded.levels
+
+            def label(level):
+                return level.item() if hasattr(level, "item") else level
+
+        else:
+            values = encoded.categories
+
+            def label(code):
+                return encoded.category_labels[code]
+
+        _add_grouped_counts(
+            counters,
+            np.repeat(groups, length),
+            encoded.window_values(values, starts, length),
+            len(self.patterns(length).first),
+            label,
+        )
+
+    def distribution(self, length, field):
+        """Counter per pattern of its ``field`` values ("levels" or "categories")
+
+        Values are counted over every position of the pattern's windows.
+        """
+        if (length, field) not in self._distributions:
+            patterns = self.patterns(length)
+            counters = []
+            self._add_distribution(
+                counters, patterns.starts, patterns.groups, length, field
+            )
+            self._distributions[(length, field)] = counters
+        return self._distributions[(length, field)]
+
+
+def _label_key(label):
+    """Form of a choice label used to match queries against the data"""
+    # casefold() turns the Turkish dotted capital into "i" plus a combining dot
+    return str(label).strip().replace("İ", "i").casefold()
+
+
+class ReliabilityIndex:
+    """Outcome of the next question after every choice pattern
+
+    ``entries`` maps a tuple of consecutive choices to how many times a
+    question followed it, how often that question was answered correctly
+    or eliminated the contestant, and the choices made on it. Entries are
+    ordered by pattern length, then by ``first_seen``, the position of the
+    first window of every pattern whether or not a question followed it.
+    """
+
+    def __init__(self, entries, max_length, first_seen):
+        self.entries = entries
+        self.max_length = max_length
+        self.first_seen = first_seen
+        self._index_patterns()
+
+    def _index_patterns(self):
+        # Pattern as it appears in the data, by its labels' _label_key()
+        self.patterns = {}
+        for pattern in self.entries:
+            self.patterns.setdefault(tuple(map(_label_key, pattern)), pattern)
+
+    def merge(self, other, offset):
+        """Add ``other``, counted on sequences appended at position ``offset``"""
+        for pattern, start in other.first_seen.items():
+            self.first_seen.setdefault(pattern, start + offset)
+
+        added = False
+        for pattern, entry in other.entries.items():
+            target = self.entries.get(pattern)
+            if target is None:
+                self.entries[pattern] = entry
+                added = True
+                continue
+            for field in ("total", "correct", "eliminated"):
+                target[field] += entry[field]
+            next_choices = target["next_choices"]
+            for choice, count in entry["next_choices"].items():
+                next_choices[choice] = next_choices.get(choice, 0) + count
+
+        if added:
+            order = sorted(
+                self.entries,
+                key=lambda pattern: (len(pattern), self.first_seen[pattern]),
+            )
+            self.entries = {pattern: self.entries[pattern] for pattern in order}
+            self._index_patterns()
+
+    def lookup(self, choices):
+        """Predict the next outcome from the longest known suffix of ``choices``
+
+        Query and data labels are compared stripped and case-folded, so "a"
+        matches "A" and "ÇEKİLDİ" matches "çekildi"; the pattern returned is
+        spelled as in the data. Returns None when not even the last choice
+        was seen before.
+        """
+        choices = [_label_key(choice) for choice in choices]
+        for length in range(min(len(choices), self.max_length), 0, -1):
+            pattern = self.patterns.get(tuple(choices[-length:]))
+            if pattern is not None:
+                entry = self.entries[pattern]
+                correct_rate = entry["correct"] / entry["total"] * 100
+                return {
+                    "pattern": list(pattern),
+                    **entry,
+                    "next_correct_rate": correct_rate,
+                    "predicted_outcome": "correct" if correct_rate >= 50 else "wrong",
+                }
+        return None
+
+
+class TransitionMatrix:
+    """Dense transition counts, ``counts[i, j]`` from ``rows[i]`` to ``columns[j]``"""
+
+    def __init__(self, rows, columns, row_codes, column_codes):
+        self.rows = list(rows)
+        self.columns = list(columns)
+        cells = np.bincount(
+            row_codes * len(self.columns) + column_codes,
+            minlength=len(self.rows) * len(self.columns),
+        )
+        counts = cells.reshape(len(self.rows), len(self.columns))
+
+        # Keep only labels that take part in at least one transition
+        used_rows = counts.any(axis=1)
+        used_columns = counts.any(axis=0)
+        self.rows = [label for label, used in zip(self.rows, used_rows) if used]
+        self.columns = [
+            label for label, used in zip(self.columns, used_columns) if used
+        ]
+        self.counts = counts[used_rows][:, used_columns]
+
+    def merge(self, other):
+        """Add the counts of ``other``, keeping labels sorted"""
+        rows, columns = list(self.rows), list(self.columns)
+        row_codes = _merge_labels(rows, other.rows)
+        column_codes = _merge_labels(columns, other.columns)
+        sorted_rows, row_positions = _sorted_codes(rows)
+        sorted_columns, column_positions = _sorted_codes(columns)
+
+        counts = np.zeros((len(rows), len(columns)), dtype=np.int64)
+        counts[
+            np.ix_(
+                row_positions[: len(self.rows)],
+                column_positions[: len(self.columns)],
+            )
+        ] += self.counts
+        counts[
+            np.ix_(row_positions[row_codes], column_positions[column_codes])
+        ] += other.counts
+        self.rows, self.columns, self.counts = sorted_rows, sorted_columns, counts
+
+    def to_json(self):
+        """Labels and sparse rows as plain lists, missing labels as None
+
+        ``cells[i]`` lists the non-zero cells of ``rows[i]`` as flat
+        ``[column index, count, column index, count, ...]`` pairs. Most real
+        rows are sparse (rare free-text answers), so this is smaller than
+        both dense rows and label-keyed objects.
+        """
+        cells = []
+        for row in self.counts:
+            columns = row.nonzero()[0]
+            cells.append(np.column_stack((columns, row[columns])).ravel().tolist())
+        return {
+            "rows": _json_labels(self.rows),
+            "columns": _json_labels(self.columns),
+            "cells": cells,
         }
 
-        for contestant, data in self.contestant_sequences.items():
-            choices = data["choices"]
-            is_correct = data["is_correct"]
-            levels = data["levels"]
-            categories = data["categories"]
 
-            # Choice to choice transitions
-            for i in range(len(choices) - 1):
-                if pd.notna(choices[i]) and pd.notna(choices[i + 1]):
-                    matrices["choice_to_choice"][choices[i]][choices[i + 1]] += 1
+def _json_labels(labels):
+    return [None if pd.isna(label) else label for label in labels]
 
-            # Correct/wrong pattern transitions
-            for i in range(len(is_correct) - 1):
-                current_state = "correct" if is_correct[i] else "wrong"
-                next_state = "correct" if is_correct[i + 1] else "wrong"
-                matrices["correct_wrong_transitions"][current_state][next_state] += 1
 
-            # Level transitions (what choice they make at each level)
-            for i in range(len(levels)):
-                if pd.notna(choices[i]):
-                    matrices["level_transitions"][levels[i]][choices[i]] += 1
+def _sorted_codes(labels):
+    """``labels`` sorted, and the sorted position of each original label"""
+    order = pd.Series(labels, dtype=object).sort_values(na_position="last").index
+    positions = np.empty(len(labels), dtype=np.int64)
+    positions[order] = np.arange(len(labels))
+    return [labels[i] for i in order], positions
 
-            # Category transitions
-            for i in range(len(categories) - 1):
+
+def _merge_labels(labels, new_labels):
+    """Codes of ``new_labels`` in ``labels``, appending the unseen ones"""
+    codes = pd.Index(labels, dtype=object).get_indexer(new_labels)
+    for i in np.flatnonzero(codes == -1):
+        codes[i] = len(labels)
+        labels.append(new_labels[i])
+    return codes
+
+
+# Worker pools by size, shared by every analyzer and kept for the process
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _worker_pool(workers):
+    """The long-lived pool of ``workers`` processes, started on first use
+
+    Workers come from a forkserver (spawn where there is none) rather than
+    forking the caller, which may be a threaded server holding locks.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=context
+            )
+        return _pools[workers]
+
+
+def _discard_worker_pool(workers, pool):
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+
+
+class SharedSequences:
+    """The per-question arrays of an EncodedSequences in shared memory
+
+    Tasks carry ``arrays``, the segment name, dtype and shape of each array,
+    so workers attach to the data instead of unpickling a copy of it.
+    Segments are unlinked by close() or once this object is collected.
+    """
+
+    FIELDS = [
+        "offsets",
+        "choices",
+        "is_correct",
+        "levels",
+        "eliminated",
+        "final_levels",
+    ]
+
+    def __init__(self, encoded):
+        self.choice_labels = list(encoded.choice_labels)
+        self.arrays = {}
+        segments = []
+        for field in self.FIELDS:
+            array = np.ascontiguousarray(getattr(encoded, field))
+            if array.dtype.hasobject:
+                # Not representable in shared memory, so it travels pickled
+                self.arrays[field] = array
+                continue
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+            segments.append(segment)
+            self.arrays[field] = (segment.name, array.dtype.str, array.shape)
+        self._finalizer = weakref.finalize(self, _release_segments, segments)
+
+    def close(self):
+        self._finalizer()
+
+
+def _release_segments(segments):
+    for segment in segments:
+        segment.close()
+        segment.unlink()
+
+
+# Shared memory segments a worker process is attached to, by name
+_worker_segments = {}
+
+
+def _attach_arrays(arrays):
+    """Arrays described by SharedSequences.arrays, as views on shared memory"""
+    names = {array[0] for array in arrays.values() if isinstance(array, tuple)}
+    # Detach from the segments of stores that were replaced since
+    for name in list(_worker_segments):
+        if name not in names:
+            _worker_segments.pop(name).close()
+
+    attached = {}
+    for field, array in arrays.items():
+        if not isinstance(array, tuple):
+            attached[field] = array
+            continue
+        name, dtype, shape = array
+        if name not in _worker_segments:
+            _worker_segments[name] = shared_memory.SharedMemory(name=name)
+        attached[field] = np.ndarray(shape, dtype, buffer=_worker_segments[name].buf)
+    return attached
+
+
+def _count_shared_shard(task):
+    """Run ``count`` over contestants ``first:last`` of a SharedSequences
+
+    The ``(contestant, data)`` pairs are rebuilt with the fields the
+    counting functions read, matching the analyzer's contestant_sequences.
+    """
+    count, arrays, choice_labels, contestants, first, last = task
+    arrays = _attach_arrays(arrays)
+    offsets = arrays["offsets"]
+    start, end = offsets[first], offsets[last]
+    labels = np.array(choice_labels + [np.nan], dtype=object)
+    # MISSING_CHOICE (-1) picks the NaN appended to the labels
+    choices = labels[arrays["choices"][start:end]].tolist()
+    is_correct = arrays["is_correct"][start:end].tolist()
+    levels = arrays["levels"][start:end].tolist()
+
+    sequences = []
+    for i, contestant in zip(range(first, last), contestants):
+        begin, stop = offsets[i] - start, offsets[i + 1] - start
+        sequences.append(
+            (
+                contestant,
+                {
+                    "choices": choices[begin:stop],
+                    "is_correct": is_correct[begin:stop],
+                    "levels": levels[begin:stop],
+                    "eliminated": arrays["eliminated"][i],
+                    "final_level": arrays["final_levels"][i],
+                },
+            )
+        )
+    return count(sequences)
+
+
+def _merge_pattern_counts(target, source):
+    """Merge ``{key: {field: value}}`` records counted on one contestant shard
+
+    Counters are added, lists extended and numbers summed. Keys first seen
+    in ``source`` are appended, so merging shards in contestant order keeps
+    the key order of a serial pass.
+    """
+    for key, record in source.items():
+        if key not in target:
+            target[key] = record
+            continue
+        for field, value in record.items():
+            if isinstance(value, Counter):
+                target[key][field].update(value)
+            elif isinstance(value, list):
+                target[key][field].extend(value)
+            else:
+                target[key][field] += value
+
+
+def _merge_level_counts(target, source):
+    """Merge ``{level: {choice: record}}`` counts like _merge_pattern_counts"""
+    for level, choices in source.items():
+        _merge_pattern_counts(target.setdefault(level, {}), choices)
+
+
+def _copy_pattern_counts(patterns):
+    """Copy of ``{key: {field: value}}`` records whose fields can be updated"""
+    return {
+        key: {
+            field: value.copy() if isinstance(value, (Counter, list)) else value
+            for field, value in record.items()
+        }
+        for key, record in patterns.items()
+    }
+
+
+def _count_first_choices(sequences):
+    """First choice records over ``(contestant, data)`` pairs"""
+    patterns = defaultdict(
+        lambda: {
+            "total_contestants": 0,
+            "second_choices": Counter(),
+            "third_choices": Counter(),
+            "elimination_rate": 0,
+            "average_final_level": 0,
+            "correct_rates": [],
+            "choice_sequences": [],
+        }
+    )
+
+    for contestant, data in sequences:
+        if len(data["choices"]) > 0:
+            first_choice = data["choices"][0]
+            if pd.notna(first_choice):
+                patterns[first_choice]["total_contestants"] += 1
+                patterns[first_choice]["correct_rates"].append(
+                    sum(data["is_correct"]) / len(data["is_correct"])
+                )
+                patterns[first_choice]["average_final_level"] += data["final_level"]
+
+                if data["eliminated"]:
+                    patterns[first_choice]["elimination_rate"] += 1
+
+                # Track second and third choices if they exist
+                if len(data["choices"]) > 1 and pd.notna(data["choices"][1]):
+                    patterns[first_choice]["second_choices"][data["choices"][1]] += 1
+
+                if len(data["choices"]) > 2 and pd.notna(data["choices"][2]):
+                    patterns[first_choice]["third_choices"][data["choices"][2]] += 1
+
+                # Store full sequence for pattern analysis
+                patterns[first_choice]["choice_sequences"].append(
+                    data["choices"][:5]
+                )  # First 5 choices
+
+    return dict(patterns)
+
+
+def _count_correct_wrong(sequences):
+    """Correct/wrong records over ``(contestant, data)`` pairs"""
+    patterns = defaultdict(
+        lambda: {
+            "occurrences": 0,
+            "next_choice_distribution": Counter(),
+            "next_is_correct_rate": 0,
+            "elimination_rate": 0,
+        }
+    )
+
+    for contestant, data in sequences:
+        choices = data["choices"]
+        is_correct = data["is_correct"]
+
+        for i in range(len(is_correct) - 1):
+            current_pattern = "correct" if is_correct[i] else "wrong"
+
+            patterns[current_pattern]["occurrences"] += 1
+
+            # Next choice
+            if i + 1 < len(choices) and pd.notna(choices[i + 1]):
+                patterns[current_pattern]["next_choice_distribution"][
+                    choices[i + 1]
+                ] += 1
+
+            # Is next answer correct?
+            if i + 1 < len(is_correct):
+                if is_correct[i + 1]:
+                    patterns[current_pattern]["next_is_correct_rate"] += 1
+
+            # Check elimination
+            if data["eliminated"] and i + 1 >= len(choices) - 1:
+                patterns[current_pattern]["elimination_rate"] += 1
+
+    return dict(patterns)
+
+
+def _count_level_choices(sequences):
+    """Per level and choice records over ``(contestant, data)`` pairs"""
+    patterns = defaultdict(
+        lambda: defaultdict(
+            lambda: {
+                "count": 0,
+                "next_level_choice": Counter(),
+                "success_rate": 0,
+                "elimination_rate": 0,
+            }
+        )
+    )
+
+    for contestant, data in sequences:
+        choices = data["choices"]
+        levels = data["levels"]
+        is_correct = data["is_correct"]
+
+        for i in range(len(choices)):
+            if pd.notna(choices[i]):
+                level = levels[i]
+                choice = choices[i]
+
+                patterns[level][choice]["count"] += 1
+
+                # Success rate
+                if is_correct[i]:
+                    patterns[level][choice]["success_rate"] += 1
+
+                # Next level choice
                 if i + 1 < len(choices) and pd.notna(choices[i + 1]):
-                    matrices["category_transitions"][categories[i]][choices[i + 1]] += 1
+                    patterns[level][choice]["next_level_choice"][choices[i + 1]] += 1
+
+                # Elimination
+                if data["eliminated"] and i >= len(choices) - 1:
+                    patterns[level][choice]["elimination_rate"] += 1
+
+    return {level: dict(choices) for level, choices in patterns.items()}
+
+
+# How the records of each per-contestant counter are merged across shards
+_COUNT_MERGES = {
+    _count_first_choices: _merge_pattern_counts,
+    _count_correct_wrong: _merge_pattern_counts,
+    _count_level_choices: _merge_level_counts,
+}
+
+
+def _group_in_first_seen_order(keys):
+    """Group ids for ``keys``, numbered by first occurrence, plus the first index"""
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    rank = np.empty(len(unique), dtype=np.int64)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(unique))
+    return rank[inverse.reshape(-1)], np.sort(first)
+
+
+def _add_grouped_counts(counters, groups, values, n_groups, label=lambda value: value):
+    """Add value counts per group to ``counters``, growing it to ``n_groups``
+
+    Keys a group has not seen yet are added in first-seen order.
+    """
+    counters.extend(Counter() for _ in range(n_groups - len(counters)))
+    pairs = pd.DataFrame({"group": groups, "value": values})
+    sizes = pairs.groupby(["group", "value"], sort=False).size()
+    for (group, value), count in sizes.items():
+        counters[group][label(value)] += int(count)
+
+
+def _add_grouped_lists(lists, groups, values, n_groups):
+    """Append ``values`` to the list of their group, growing it to ``n_groups``"""
+    lists.extend([] for _ in range(n_groups - len(lists)))
+    if len(groups) == 0:
+        return
+    order = np.argsort(groups, kind="stable")
+    touched, bounds = np.unique(groups[order], return_index=True)
+    for group, part in zip(touched, np.split(values[order], bounds[1:])):
+        lists[group].extend(part.tolist())
+
+
+def _grouped_sums(groups, values, totals):
+    """Add ``values`` per group to ``totals``, one at a time in input order"""
+    totals = np.array(totals, dtype=np.float64)
+    np.add.at(totals, groups, values)
+    return totals
+
+
+class ContestantPatternAnalyzer:
+    # Bumped whenever the layout written by save_state() changes
+    STATE_VERSION = 5
+
+    def __init__(self, csv_file, workers=1):
+        # Accept an already loaded DataFrame as well as a CSV path
+        if isinstance(csv_file, pd.DataFrame):
+            self.df = csv_file
+        else:
+            self.df = pd.read_csv(csv_file)
+        # Processes used by the per-contestant counters, None for one per CPU
+        self.workers = workers or os.cpu_count() or 1
+        self._shared = None
+        self._analyze()
+
+    @property
+    def df(self):
+        # update() collects new rows and concatenates them only when asked
+        if len(self._frames) > 1:
+            self._frames = [pd.concat(self._frames, ignore_index=True)]
+        return self._frames[0]
+
+    @df.setter
+    def df(self, df):
+        self._frames = [df]
+        self._row_count = len(df)
+
+    def _analyze(self):
+        """Build the contestant sequences; everything else is derived lazily"""
+        self.contestant_sequences, self.encoded_sequences = (
+            self._build_contestant_sequences(self.df)
+        )
+        self._reset_derived()
+
+    def _reset_derived(self):
+        self._release_shared()
+        self._ngram_index = None
+        self._transition_matrices = None
+        self._performance_clusters = None
+        self._reliability_index = None
+        self._winning_counts = None
+        # Unnormalised records of each per-contestant counter
+        self._contestant_counts = {}
+        self._report_sections = {}
+
+    @property
+    def ngram_index(self):
+        if self._ngram_index is None:
+            self._ngram_index = NGramIndex(self.encoded_sequences)
+        return self._ngram_index
+
+    @property
+    def reliability_index(self):
+        if self._reliability_index is None:
+            self._reliability_index = self._build_reliability_index(self.ngram_index)
+        return self._reliability_index
+
+    @property
+    def transition_matrices(self):
+        if self._transition_matrices is None:
+            self._transition_matrices = self._build_transition_matrices(
+                self.encoded_sequences
+            )
+        return self._transition_matrices
+
+    @property
+    def performance_clusters(self):
+        if self._performance_clusters is None:
+            self._performance_clusters = self._analyze_performance_clusters(
+                self.contestant_sequences
+            )
+        return self._performance_clusters
+
+    def update(self, new_rows):
+        """Add the questions of new episodes to the analysis
+
+        ``new_rows`` is a DataFrame or CSV path with the dataset columns.
+        Only the new contestants are counted: their counts are added to
+        every aggregate built so far (n-gram index, transition matrices,
+        reliability index, clusters and per-contestant records), and report
+        sections are re-derived from those on next use. Rows for an already
+        known contestant change that contestant's earlier sequence, so they
+        trigger a full rebuild.
+        """
+        if not isinstance(new_rows, pd.DataFrame):
+            new_rows = pd.read_csv(new_rows)
+        if new_rows.empty:
+            return
+
+        known = self.contestant_sequences
+        if any(contestant in known for contestant in new_rows["contestant"].unique()):
+            self.df = pd.concat([self.df, new_rows], ignore_index=True)
+            self._analyze()
+            return
+
+        self._frames.append(new_rows)
+        self._row_count += len(new_rows)
+        sequences, encoded = self._build_contestant_sequences(new_rows)
+        offset = len(self.encoded_sequences.choices)
+        # Counted on the new sequences alone, before they join the store
+        new_ngrams = NGramIndex(encoded)
+
+        first = len(self.contestant_sequences)
+        self.contestant_sequences.update(sequences)
+        self.encoded_sequences.extend(encoded)
+        self._release_shared()
+        if self._ngram_index is not None:
+            self._ngram_index.extend(offset)
+        if self._transition_matrices is not None:
+            for name, matrix in self._build_transition_matrices(encoded).items():
+                self._transition_matrices[name].merge(matrix)
+        if self._reliability_index is not None:
+            self._reliability_index.merge(
+                self._build_reliability_index(new_ngrams), offset
+            )
+        if self._winning_counts is not None:
+            for pattern, count in self._count_winning_patterns(new_ngrams).items():
+                self._winning_counts[pattern] = (
+                    self._winning_counts.get(pattern, 0) + count
+                )
+        for count, patterns in self._contestant_counts.items():
+            _COUNT_MERGES[count](patterns, self._count_contestants(count, first))
+        if self._performance_clusters is not None:
+            clusters = self._analyze_performance_clusters(sequences)
+            for name, contestants in clusters.items():
+                self._performance_clusters[name].extend(contestants)
+        self._report_sections = {}
+
+    def save_state(self, path):
+        """Persist the analyzer so it can be restored without rebuilding"""
+        state = {
+            "version": self.STATE_VERSION,
+            "df": self.df,
+            "contestant_sequences": self.contestant_sequences,
+            "encoded_sequences": self.encoded_sequences,
+            "performance_clusters": self.performance_clusters,
+            "reliability_index": self.reliability_index,
+        }
+        # Write atomically so a crash never leaves a truncated state file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_state(cls, path, workers=1):
+        """Restore an analyzer written by save_state()"""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != cls.STATE_VERSION:
+            raise ValueError(f"Unsupported pattern analyzer state in {path}")
+
+        analyzer = cls.__new__(cls)
+        analyzer.workers = workers or os.cpu_count() or 1
+        analyzer.df = state["df"]
+        analyzer.contestant_sequences = state["contestant_sequences"]
+        analyzer.encoded_sequences = state["encoded_sequences"]
+        analyzer._shared = None
+        analyzer._reset_derived()
+        analyzer._performance_clusters = state["performance_clusters"]
+        analyzer._reliability_index = state["reliability_index"]
+        return analyzer
+
+    def _count_contestants(self, count, first=0):
+        """Merged ``count`` records of the contestants from ``first`` on, unnormalised"""
+        patterns = {}
+        for counts in self._map_contestants(count, first):
+            _COUNT_MERGES[count](patterns, counts)
+        return patterns
+
+    def _contestant_records(self, count):
+        """Copy of the ``count`` records of all contestants, ready to normalise"""
+        if count not in self._contestant_counts:
+            self._contestant_counts[count] = self._count_contestants(count)
+        patterns = self._contestant_counts[count]
+        if count is _count_level_choices:
+            return {
+                level: _copy_pattern_counts(choices)
+                for level, choices in patterns.items()
+            }
+        return _copy_pattern_counts(patterns)
+
+    def _release_shared(self):
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _map_contestants(self, count, first=0):
+        """Apply ``count`` to contiguous shards of the contestants from ``first`` on
+
+        Returns one result per shard in contestant order. With more than one
+        worker the shards are counted in the long-lived process pool, so
+        ``count`` must be a module-level function returning picklable values.
+        The encoded arrays are placed in shared memory once per version of
+        the store; tasks carry only segment names and shard bounds.
+        """
+        last = len(self.contestant_sequences)
+        if self.workers <= 1 or last - first < 2:
+            return [count(list(islice(self.contestant_sequences.items(), first, None)))]
+
+        if self._shared is None:
+            self._shared = SharedSequences(self.encoded_sequences)
+        shared = self._shared
+        contestants = self.encoded_sequences.contestants
+        bounds = np.linspace(first, last, self.workers + 1).astype(int)
+        tasks = [
+            (
+                count,
+                shared.arrays,
+                shared.choice_labels,
+                contestants[start:end].tolist(),
+                start,
+                end,
+            )
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        pool = _worker_pool(self.workers)
+        try:
+            return list(pool.map(_count_shared_shard, tasks))
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call
+            _discard_worker_pool(self.workers, pool)
+            raise
+
+    def _build_contestant_sequences(self, df):
+        """Build sequences of choices for each contestant in ``df``
+
+        Returns the sequences keyed by contestant and the same sequences as
+        an EncodedSequences store.
+        """
+        # One stable sort by (contestant, level) replaces a mask per contestant;
+        # contestants keep their order of first appearance
+        codes, contestants = pd.factorize(df["contestant"])
+        levels = df["level"].to_numpy()
+        order = np.lexsort((levels, codes))
+        order = order[codes[order] >= 0]  # Drop rows without a contestant
+        ordered = df.iloc[order]
+
+        counts = np.bincount(codes[order], minlength=len(contestants))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        ends = starts + counts
+
+        columns = {
+            "choices": ordered["contestant_answer"].tolist(),
+            "correct": ordered["correct_answer"].tolist(),
+            "is_correct": ordered["is_correct"].tolist(),
+            "levels": ordered["level"].tolist(),
+            "categories": ordered["category"].tolist(),
+            "jokers": ordered["joker_used"].tolist(),
+        }
+        encoded = EncodedSequences(contestants, counts, ordered)
+        eliminated = encoded.eliminated
+        final_levels = encoded.final_levels
 
-        return matrices
+        sequences = {}
+        for i, contestant in enumerate(contestants):
+            start, end = starts[i], ends[i]
+            sequences[contestant] = {
+                name: values[start:end] for name, values in columns.items()
+            }
+            sequences[contestant]["eliminated"] = eliminated[i]
+            sequences[contestant]["final_level"] = final_levels[i]
+
+        return sequences, encoded
+
+    def _build_transition_matrices(self, encoded):
+        """Build transition matrices for choice patterns of ``encoded``"""
+        choices, choice_positions = _sorted_codes(encoded.choice_labels)
+        categories, category_positions = _sorted_codes(encoded.category_labels)
+        levels, level_codes = np.unique(encoded.levels, return_inverse=True)
+
+        # Choice codes in sorted label order, -1 where no answer was recorded
+        codes = np.append(choice_positions, -1)[encoded.choices]
+        answered = codes >= 0
+        states = np.where(encoded.is_correct, 0, 1)
+
+        # Consecutive questions of the same contestant
+        positions = np.arange(len(codes))
+        current = positions[positions + 1 < encoded.sequence_ends]
+        following = current + 1
+        both = answered[current] & answered[following]
+        next_answered = answered[following]
+
+        return {
+            # Choice to choice transitions
+            "choice_to_choice": TransitionMatrix(
+                choices, choices, codes[current[both]], codes[following[both]]
+            ),
+            # Correct/wrong pattern transitions
+            "correct_wrong_transitions": TransitionMatrix(
+                ["correct", "wrong"],
+                ["correct", "wrong"],
+                states[current],
+                states[following],
+            ),
+            # Level transitions (what choice they make at each level)
+            "level_transitions": TransitionMatrix(
+                levels.tolist(),
+                choices,
+                level_codes.reshape(-1)[answered],
+                codes[answered],
+            ),
+            # Category transitions
+            "category_transitions": TransitionMatrix(
+                categories,
+                choices,
+                category_positions[encoded.categories[current[next_answered]]],
+                codes[following[next_answered]],
+            ),
+        }
 
-    def _analyze_performance_clusters(self):
-        """Cluster contestants by performance patterns"""
+    def _analyze_performance_clusters(self, sequences):
+        """Cluster the contestants of ``sequences`` by performance patterns"""
         clusters = {
             "high_performers": [],  # Reached level 10+
             "mid_performers": [],  # Reached level 5-9
@@ -80,20 +1224,9 @@ class ContestantPatternAnalyzer:
             "pattern_followers": [],  # Followed specific patterns
         }
 
-        for contestant, data in self.contestant_sequences.items():
+        for contestant, data in sequences.items():
             final_level = data["final_level"]
-            joker_count = sum(
-                1
-                for i, level in enumerate(data["levels"])
-                if i
-                < len(
-                    self.df[self.df["contestant"] == contestant]["joker_used"].tolist()
-                )
-                and self.df[self.df["contestant"] == contestant]["joker_used"].tolist()[
-                    i
-                ]
-                != "yok"
-            )
+            joker_count = sum(1 for joker in data["jokers"] if joker != "yok")
 
             if final_level >= 10:
                 clusters["high_performers"].append(contestant)
@@ -109,44 +1242,7 @@ class ContestantPatternAnalyzer:
 
     def analyze_first_choice_patterns(self):
         """Analyze patterns based on first choice"""
-        patterns = defaultdict(
-            lambda: {
-                "total_contestants": 0,
-                "second_choices": Counter(),
-                "third_choices": Counter(),
-                "elimination_rate": 0,
-                "average_final_level": 0,
-                "correct_rates": [],
-                "choice_sequences": [],
-            }
-        )
-
-        for contestant, data in self.contestant_sequences.items():
-            if len(data["choices"]) > 0:
-                first_choice = data["choices"][0]
-                if pd.notna(first_choice):
-                    patterns[first_choice]["total_contestants"] += 1
-                    patterns[first_choice]["correct_rates"].append(
-                        sum(data["is_correct"]) / len(data["is_correct"])
-                    )
-                    patterns[first_choice]["average_final_level"] += data["final_level"]
-
-                    if data["eliminated"]:
-                        patterns[first_choice]["elimination_rate"] += 1
-
-                    # Track second and third choices if they exist
-                    if len(data["choices"]) > 1 and pd.notna(data["choices"][1]):
-                        patterns[first_choice]["second_choices"][
-                            data["choices"][1]
-                        ] += 1
-
-                    if len(data["choices"]) > 2 and pd.notna(data["choices"][2]):
-                        patterns[first_choice]["third_choices"][data["choices"][2]] += 1
-
-                    # Store full sequence for pattern analysis
-                    patterns[first_choice]["choice_sequences"].append(
-                        data["choices"][:5]
-                    )  # First 5 choices
+        patterns = self._contestant_records(_count_first_choices)
 
         # Calculate final statistics
         for choice in patterns:
@@ -166,171 +1262,57 @@ class ContestantPatternAnalyzer:
 
     def analyze_sequential_patterns(self, sequence_length=3):
         """Analyze patterns in consecutive choices (simple version)"""
-        patterns = defaultdict(
-            lambda: {
-                "occurrences": 0,
-                "next_choices": Counter(),
-                "success_rate": 0,
-                "elimination_rate": 0,
-                "contestants": [],
-            }
-        )
-
-        for contestant, data in self.contestant_sequences.items():
-            choices = data["choices"]
-            is_correct = data["is_correct"]
-
-            for i in range(len(choices) - sequence_length + 1):
-                sequence = tuple(choices[i : i + sequence_length])
-
-                # Skip if any choice in sequence is NaN
-                if any(pd.isna(choice) for choice in sequence):
-                    continue
-
-                patterns[sequence]["occurrences"] += 1
-                patterns[sequence]["contestants"].append(contestant)
-
-                # Check if there's a next choice
-                if i + sequence_length < len(choices):
-                    next_choice = choices[i + sequence_length]
-                    if pd.notna(next_choice):
-                        patterns[sequence]["next_choices"][next_choice] += 1
-
-                # Calculate success rate for this sequence
-                sequence_correct = is_correct[i : i + sequence_length]
-                if len(sequence_correct) > 0:
-                    patterns[sequence]["success_rate"] += sum(sequence_correct) / len(
-                        sequence_correct
-                    )
+        ngrams = self.ngram_index
+        counts = ngrams.patterns(sequence_length)
+        next_choices = ngrams.next_choices(sequence_length)
+        contestants = ngrams.contestants(sequence_length)
 
-                # Check if eliminated after this sequence
-                if data["eliminated"] and i + sequence_length >= len(choices):
-                    patterns[sequence]["elimination_rate"] += 1
-
-        # Calculate final statistics
-        for sequence in patterns:
-            total = patterns[sequence]["occurrences"]
-            if total > 0:
-                patterns[sequence]["success_rate"] = (
-                    patterns[sequence]["success_rate"] / total * 100
-                )
-                patterns[sequence]["elimination_rate"] = (
-                    patterns[sequence]["elimination_rate"] / total * 100
-                )
+        patterns = {}
+        for i, sequence in enumerate(ngrams.labels(sequence_length)):
+            total = int(counts.occurrences[i])
+            patterns[sequence] = {
+                "occurrences": total,
+                "next_choices": next_choices[i],
+                "success_rate": float(counts.success[i]) / total * 100,
+                "elimination_rate": int(counts.eliminations[i]) / total * 100,
+                "contestants": contestants[i],
+            }
 
-        return dict(patterns)
+        return patterns
 
     def analyze_deep_sequential_patterns(self, max_length=6):
         """Analyze deeper sequential patterns of various lengths"""
+        ngrams = self.ngram_index
         patterns = {}
 
         for length in range(2, max_length + 1):
-            patterns[f"length_{length}"] = defaultdict(
-                lambda: {
-                    "occurrences": 0,
-                    "success_rate": 0,
-                    "elimination_rate": 0,
-                    "next_choice_predictions": Counter(),
-                    "level_distribution": Counter(),
-                    "category_distribution": Counter(),
-                    "contestants": [],
+            counts = ngrams.patterns(length)
+            next_choice_predictions = ngrams.next_choices(length)
+            contestants = ngrams.contestants(length)
+
+            # Level and category distribution over every question in the window
+            level_distribution = ngrams.distribution(length, "levels")
+            category_distribution = ngrams.distribution(length, "categories")
+
+            length_patterns = {}
+            for i, sequence in enumerate(ngrams.labels(length)):
+                total = int(counts.occurrences[i])
+                length_patterns["->".join(sequence)] = {
+                    "occurrences": total,
+                    "success_rate": float(counts.success[i]) / total * 100,
+                    "elimination_rate": int(counts.eliminations[i]) / total * 100,
+                    "next_choice_predictions": next_choice_predictions[i],
+                    "level_distribution": level_distribution[i],
+                    "category_distribution": category_distribution[i],
+                    "contestants": contestants[i],
                 }
-            )
-
-            for contestant, data in self.contestant_sequences.items():
-                choices = data["choices"]
-                is_correct = data["is_correct"]
-                levels = data["levels"]
-                categories = data["categories"]
-
-                for i in range(len(choices) - length + 1):
-                    sequence = tuple(choices[i : i + length])
-
-                    if any(pd.isna(choice) for choice in sequence):
-                        continue
-
-                    pattern_key = "->".join(sequence)
-                    pattern_data = patterns[f"length_{length}"][pattern_key]
-
-                    pattern_data["occurrences"] += 1
-                    pattern_data["contestants"].append(contestant)
-
-                    # Success rate for this sequence
-                    sequence_correct = is_correct[i : i + length]
-                    if len(sequence_correct) > 0:
-                        pattern_data["success_rate"] += sum(sequence_correct) / len(
-                            sequence_correct
-                        )
-
-                    # Level and category distribution
-                    for j in range(length):
-                        if i + j < len(levels):
-                            pattern_data["level_distribution"][levels[i + j]] += 1
-                        if i + j < len(categories):
-                            pattern_data["category_distribution"][
-                                categories[i + j]
-                            ] += 1
-
-                    # Predict next choice
-                    if i + length < len(choices) and pd.notna(choices[i + length]):
-                        pattern_data["next_choice_predictions"][
-                            choices[i + length]
-                        ] += 1
-
-                    # Elimination tracking
-                    if data["eliminated"] and i + length >= len(choices):
-                        pattern_data["elimination_rate"] += 1
-
-        # Calculate final statistics
-        for length_key in patterns:
-            for pattern_key in patterns[length_key]:
-                total = patterns[length_key][pattern_key]["occurrences"]
-                if total > 0:
-                    patterns[length_key][pattern_key]["success_rate"] = (
-                        patterns[length_key][pattern_key]["success_rate"] / total * 100
-                    )
-                    patterns[length_key][pattern_key]["elimination_rate"] = (
-                        patterns[length_key][pattern_key]["elimination_rate"]
-                        / total
-                        * 100
-                    )
+            patterns[f"length_{length}"] = length_patterns
 
         return patterns
 
     def analyze_correct_wrong_patterns(self):
         """Analyze patterns based on correct/wrong sequences"""
-        patterns = defaultdict(
-            lambda: {
-                "occurrences": 0,
-                "next_choice_distribution": Counter(),
-                "next_is_correct_rate": 0,
-                "elimination_rate": 0,
-            }
-        )
-
-        for contestant, data in self.contestant_sequences.items():
-            choices = data["choices"]
-            is_correct = data["is_correct"]
-
-            for i in range(len(is_correct) - 1):
-                current_pattern = "correct" if is_correct[i] else "wrong"
-
-                patterns[current_pattern]["occurrences"] += 1
-
-                # Next choice
-                if i + 1 < len(choices) and pd.notna(choices[i + 1]):
-                    patterns[current_pattern]["next_choice_distribution"][
-                        choices[i + 1]
-                    ] += 1
-
-                # Is next answer correct?
-                if i + 1 < len(is_correct):
-                    if is_correct[i + 1]:
-                        patterns[current_pattern]["next_is_correct_rate"] += 1
-
-                # Check elimination
-                if data["eliminated"] and i + 1 >= len(choices) - 1:
-                    patterns[current_pattern]["elimination_rate"] += 1
+        patterns = self._contestant_records(_count_correct_wrong)
 
         # Calculate final statistics
         for pattern in patterns:
@@ -347,42 +1329,7 @@ class ContestantPatternAnalyzer:
 
     def analyze_level_based_patterns(self):
         """Analyze choice patterns by level"""
-        patterns = defaultdict(
-            lambda: defaultdict(
-                lambda: {
-                    "count": 0,
-                    "next_level_choice": Counter(),
-                    "success_rate": 0,
-                    "elimination_rate": 0,
-                }
-            )
-        )
-
-        for contestant, data in self.contestant_sequences.items():
-            choices = data["choices"]
-            levels = data["levels"]
-            is_correct = data["is_correct"]
-
-            for i in range(len(choices)):
-                if pd.notna(choices[i]):
-                    level = levels[i]
-                    choice = choices[i]
-
-                    patterns[level][choice]["count"] += 1
-
-                    # Success rate
-                    if is_correct[i]:
-                        patterns[level][choice]["success_rate"] += 1
-
-                    # Next level choice
-                    if i + 1 < len(choices) and pd.notna(choices[i + 1]):
-                        patterns[level][choice]["next_level_choice"][
-                            choices[i + 1]
-                        ] += 1
-
-                    # Elimination
-                    if data["eliminated"] and i >= len(choices) - 1:
-                        patterns[level][choice]["elimination_rate"] += 1
+        patterns = self._contestant_records(_count_level_choices)
 
         # Calculate final statistics
         for level in patterns:
@@ -403,70 +1350,168 @@ class ContestantPatternAnalyzer:
         winning_patterns = []
 
         # Analyze contestants who reached high levels
-        high_performers = []
-        for contestant, data in self.contestant_sequences.items():
-            if data["final_level"] >= 10:  # High level threshold
-                high_performers.append(contestant)
+        high_performer_count = int((self.encoded_sequences.final_levels >= 10).sum())
 
         # Find common patterns among high performers
-        if len(high_performers) >= 3:
-            pattern_counts = defaultdict(int)
-
-            for contestant in high_performers:
-                data = self.contestant_sequences[contestant]
-                choices = data["choices"]
-
-                # Check various pattern lengths
-                for length in [2, 3, 4]:
-                    for i in range(len(choices) - length + 1):
-                        pattern = tuple(choices[i : i + length])
-                        if not any(pd.isna(choice) for choice in pattern):
-                            pattern_counts[pattern] += 1
+        if high_performer_count >= 3:
+            if self._winning_counts is None:
+                self._winning_counts = self._count_winning_patterns(self.ngram_index)
 
             # Filter patterns with minimum occurrences
-            for pattern, count in pattern_counts.items():
+            for pattern, count in self._winning_counts.items():
                 if count >= min_occurrences:
                     winning_patterns.append(
                         {
                             "pattern": pattern,
                             "occurrences": count,
-                            "success_rate": count / len(high_performers) * 100,
+                            "success_rate": count / high_performer_count * 100,
                         }
                     )
 
         return sorted(winning_patterns, key=lambda x: x["success_rate"], reverse=True)
 
-    def generate_comprehensive_report(self):
-        """Generate a comprehensive pattern analysis report"""
-        print("Generating comprehensive pattern analysis...")
+    def _count_winning_patterns(self, ngrams):
+        """Occurrences of 2 to 4 choice patterns among high performers
+
+        Patterns are keyed by their choices, in order of first occurrence by
+        contestant, pattern length and position.
+        """
+        encoded = ngrams.encoded
+        high_performers = encoded.final_levels >= 10  # High level threshold
+        keys, starts, lengths = [], [], []
+
+        # Check various pattern lengths
+        for length in [2, 3, 4]:
+            length_starts, nodes = ngrams.windows(length)
+            mine = high_performers[encoded.owners[length_starts]]
+            # Tag node ids with their length so patterns of different lengths differ
+            keys.append(nodes[mine] * 8 + length)
+            starts.append(length_starts[mine])
+            lengths.append(np.full(int(mine.sum()), length))
+
+        keys, starts, lengths = (
+            np.concatenate(keys),
+            np.concatenate(starts),
+            np.concatenate(lengths),
+        )
 
-        report = {
-            "summary_statistics": {
+        # Count in the order contestant, pattern length, position
+        order = np.lexsort((starts, lengths, encoded.owners[starts]))
+        keys, starts, lengths = keys[order], starts[order], lengths[order]
+        groups, first = _group_in_first_seen_order(keys)
+        counts = np.bincount(groups, minlength=len(first))
+
+        return {
+            encoded.window_labels(starts[start : start + 1], lengths[start])[0]: int(
+                counts[i]
+            )
+            for i, start in enumerate(first)
+        }
+
+    def _build_reliability_index(self, ngrams, max_length=6):
+        """Count next-question outcomes after patterns of 1 to ``max_length`` choices"""
+        encoded = ngrams.encoded
+        entries = {}
+        first_seen = {}
+
+        for length in range(1, max_length + 1):
+            counts = ngrams.patterns(length)
+            n_patterns = len(counts.first)
+
+            # Windows followed by another question of the same contestant
+            following = counts.starts + length
+            has_next = following < encoded.sequence_ends[counts.starts]
+            groups, following = counts.groups[has_next], following[has_next]
+            last = following + 1 == encoded.sequence_ends[following]
+            eliminated = last & encoded.eliminated[encoded.owners[following]]
+
+            totals = np.bincount(groups, minlength=n_patterns)
+            correct = np.bincount(
+                groups[encoded.is_correct[following]], minlength=n_patterns
+            )
+            eliminations = np.bincount(groups[eliminated], minlength=n_patterns)
+            next_choices = ngrams.next_choices(length)
+
+            first_starts = counts.starts[counts.first].tolist()
+            for i, pattern in enumerate(ngrams.labels(length)):
+                first_seen[pattern] = first_starts[i]
+                if totals[i]:
+                    entries[pattern] = {
+                        "total": int(totals[i]),
+                        "correct": int(correct[i]),
+                        "eliminated": int(eliminations[i]),
+                        "next_choices": dict(next_choices[i]),
+                    }
+
+        return ReliabilityIndex(entries, max_length, first_seen)
+
+    def find_predictive_patterns(self):
+        """Next-question outcomes after each choice pattern"""
+        return {
+            "pattern_reliability": {
+                "->".join(pattern): entry
+                for pattern, entry in self.reliability_index.entries.items()
+            }
+        }
+
+    def predict_next_outcome(self, choices):
+        """Predicted outcome of the next question after ``choices`` so far"""
+        return self.reliability_index.lookup(list(choices))
+
+    def generate_comprehensive_report(self, sections=None):
+        """Generate a comprehensive pattern analysis report
+
+        ``sections`` limits the report to some of REPORT_SECTIONS. Each
+        section is computed on first request and memoized until update().
+        """
+        if sections is None:
+            sections = REPORT_SECTIONS
+        unknown = [name for name in sections if name not in REPORT_SECTIONS]
+        if unknown:
+            raise ValueError(f"unknown report sections: {', '.join(unknown)}")
+
+        missing = [name for name in sections if name not in self._report_sections]
+        if missing:
+            print("Generating comprehensive pattern analysis...")
+
+        report = {}
+        for name in REPORT_SECTIONS:
+            if name in sections:
+                if name not in self._report_sections:
+                    self._report_sections[name] = self._build_report_section(name)
+                report[name] = self._report_sections[name]
+
+        return report
+
+    def _build_report_section(self, name):
+        if name == "summary_statistics":
+            return {
                 "total_contestants": len(self.contestant_sequences),
-                "total_questions": len(self.df),
-                "average_questions_per_contestant": len(self.df)
+                "total_questions": self._row_count,
+                "average_questions_per_contestant": self._row_count
                 / len(self.contestant_sequences),
-                "elimination_rate": sum(
-                    1
-                    for data in self.contestant_sequences.values()
-                    if data["eliminated"]
-                )
+                "elimination_rate": int(self.encoded_sequences.eliminated.sum())
                 / len(self.contestant_sequences)
                 * 100,
-            },
-            "performance_clusters": self.performance_clusters,
-            "transition_matrices": self._convert_nested_keys(self.transition_matrices),
-            "first_choice_patterns": self.analyze_first_choice_patterns(),
-            "sequential_patterns": self._convert_tuple_keys(self.analyze_sequential_patterns()),
-            "deep_sequential_patterns": self._convert_nested_keys(
-                self.analyze_deep_sequential_patterns()
-            ),
-            "correct_wrong_patterns": self.analyze_correct_wrong_patterns(),
-            "level_based_patterns": self._convert_nested_keys(self.analyze_level_based_patterns()),
-            "winning_patterns": self.find_winning_patterns(),
-        }
-
-        return report
+            }
+        if name == "performance_clusters":
+            return self.performance_clusters
+        if name == "transition_matrices":
+            return {
+                matrix_type: matrix.to_json()
+                for matrix_type, matrix in self.transition_matrices.items()
+            }
+        if name == "first_choice_patterns":
+            return self.analyze_first_choice_patterns()
+        if name == "sequential_patterns":
+            return self._convert_tuple_keys(self.analyze_sequential_patterns())
+        if name == "deep_sequential_patterns":
+            return self._convert_nested_keys(self.analyze_deep_sequential_patterns())
+        if name == "correct_wrong_patterns":
+            return self.analyze_correct_wrong_patterns()
+        if name == "level_based_patterns":
+            return self._convert_nested_keys(self.analyze_level_based_patterns())
+        return self.find_winning_patterns()
 
     def _generate_advanced_insights(self):
         """Generate advanced insights from all analyses"""
@@ -479,14 +1524,12 @@ class ContestantPatternAnalyzer:
             "predictive_insights": [],
         }
 
-        # Analyze elimination patterns
-        elimination_data = self.analyze_elimination_patterns()
+        # Predictive insights
+        predictive = self.find_predictive_patterns()
 
-        # Find most dangerous patterns
-        for pattern_key, pattern_data in elimination_data[
-            "elimination_by_pattern"
-        ].items():
-            total = pattern_data["eliminated"] + pattern_data["survived"]
+        # Find most dangerous patterns: the next question often eliminates
+        for pattern_key, pattern_data in predictive["pattern_reliability"].items():
+            total = pattern_data["total"]
             if total >= 3:  # Minimum occurrences
                 elimination_rate = pattern_data["eliminated"] / total * 100
                 if elimination_rate > 70:  # High elimination rate
@@ -515,13 +1558,20 @@ class ContestantPatternAnalyzer:
                         }
                     )
 
-        # Analyze psychological patterns
-        psychology = self.analyze_psychological_patterns()
-
-        # Choice evolution insights
-        for choice, level_data in psychology["choice_bias_evolution"].items():
-            early_levels = sum(len(level_data.get(i, [])) for i in range(1, 6))
-            late_levels = sum(len(level_data.get(i, [])) for i in range(6, 14))
+        # Choice evolution insights: how often each choice is made per level
+        level_patterns = self.analyze_level_based_patterns()
+        choices = sorted(
+            {choice for level_data in level_patterns.values() for choice in level_data},
+            key=str,
+        )
+        for choice in choices:
+            level_data = {
+                level: counts[choice]["count"]
+                for level, counts in level_patterns.items()
+                if choice in counts
+            }
+            early_levels = sum(level_data.get(i, 0) for i in range(1, 6))
+            late_levels = sum(level_data.get(i, 0) for i in range(6, 14))
 
             if early_levels > 0 and late_levels > 0:
                 evolution_ratio = late_levels / early_levels
@@ -559,9 +1609,6 @@ class ContestantPatternAnalyzer:
                             {"pattern": "mostly_wrong_in_final_stretch", "frequency": 1}
                         )
 
-        # Predictive insights
-        predictive = self.find_predictive_patterns()
-
         # Most reliable patterns for prediction
         for pattern_key, reliability_data in predictive["pattern_reliability"].items():
             if reliability_data["total"] >= 5:
@@ -635,9 +1682,12 @@ if __name__ == "__main__":
     print(f"\n🔗 TRANSITION PATTERNS")
     choice_transitions = report["transition_matrices"]["choice_to_choice"]
     print("Most common choice transitions:")
-    for from_choice, to_choices in choice_transitions.items():
-        if isinstance(to_choices, dict):
-            most_common = max(to_choices.items(), key=lambda x: x[1])
+    for from_choice, cells in zip(
+        choice_transitions["rows"], choice_transitions["cells"]
+    ):
+        if cells:
+            column, count = max(zip(cells[::2], cells[1::2]), key=lambda x: x[1])
+            most_common = (choice_transitions["columns"][column], count)
             print(f"  {from_choice} → {most_common[0]} ({most_common[1]} times)")
 
     print(f"\n🎲 FIRST CHOICE IMPACT")
@@ -701,6 +1751,18 @@ if __name__ == "__main__":
     for pattern in all_successful_patterns[:10]:
         print(f"  {pattern['pattern']}: {pattern['success_rate']:.1f}% success rate ({pattern['occurrences']} times)")
 
+    insights = analyzer._generate_advanced_insights()
+    print("\nMost reliable predictive patterns (next question >75% correct):")
+    for insight in sorted(
+        insights["predictive_insights"],
+        key=lambda x: x["prediction_accuracy"],
+        reverse=True,
+    )[:10]:
+        print(
+            f"  {insight['pattern']}: {insight['prediction_accuracy']:.1f}% "
+            f"({insight['sample_size']} times)"
+        )
+
     print(f"\n💡 KEY FINDINGS")
     print("1. Sequential patterns show clear success/failure correlations")
     print("2. First choice significantly impacts performance trajectory")
@@ -720,10 +1782,11 @@ if __name__ == "__main__":
     print("\n=== TRANSITION MATRICES ANALYSIS ===")
     for matrix_type, matrix in report["transition_matrices"].items():
         print(f"\nMatrix Type: {matrix_type}")
-        for key, transitions in matrix.items():
-            print(f"From {key}:")
-            for target, count in transitions.items():
-                print(f"  - To {target}: {count} times")
+        for key, cells in zip(matrix["rows"], matrix["cells"]):
+            if cells:
+                print(f"From {key}:")
+            for column, count in zip(cells[::2], cells[1::2]):
+                print(f"  - To {matrix['columns'][column]}: {count} times")
 
     print("\n=== PERFORMANCE CLUSTERS ===")
     for cluster_type, contestants in report["performance_clusters"].items():
@@ -36,108 +36,107 @@ function setupEventListeners() {
     }
 }
 
-// Load all analytical data from API
-async function loadAnalyticalData() {
-    try {
-        showLoading();
-
-        console.log('Starting to load analytical data...');
-
-        // Load basic stats
-        console.log('Loading basic stats...');
-        const statsResponse = await axios.get('/api/stats');
-        updateStatsCards(statsResponse.data);
-        console.log('Basic stats loaded successfully');
-
-        // Load category analysis
-        console.log('Loading category analysis...');
-        try {
-            const categoryResponse = await axios.get('/api/category_stats');
-            analysisData.categories = categoryResponse.data;
-            createCategoryAnalysisChart(categoryResponse.data);
-            populateCategoryLevelTable(categoryResponse.data);
-            console.log('Category analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading category analysis:', error);
+// Dashboard sections, keyed by the /api/<name> endpoint that serves their data
+const dashboardSections = [
+    {
+        name: 'stats',
+        label: 'basic stats',
+        render: function (data) {
+            updateStatsCards(data);
         }
-
-        // Load level analysis
-        console.log('Loading level analysis...');
-        try {
-            const levelResponse = await axios.get('/api/level_stats');
-            analysisData.levels = levelResponse.data;
-            createLevelAnalysisChart(levelResponse.data);
-            console.log('Level analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading level analysis:', error);
+    },
+    {
+        name: 'category_stats',
+        label: 'category analysis',
+        render: function (data) {
+            analysisData.categories = data;
+            createCategoryAnalysisChart(data);
+            populateCategoryLevelTable(data);
         }
-
-        // Load joker analysis
-        console.log('Loading joker analysis...');
-        try {
-            const jokerResponse = await axios.get('/api/joker_stats');
-            analysisData.jokers = jokerResponse.data;
-            createJokerAnalysisChart(jokerResponse.data);
-            console.log('Joker analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading joker analysis:', error);
+    },
+    {
+        name: 'level_stats',
+        label: 'level analysis',
+        render: function (data) {
+            analysisData.levels = data;
+            createLevelAnalysisChart(data);
         }
-
-        // Load answer choice analysis
-        console.log('Loading answer choice analysis...');
-        try {
-            const answerResponse = await axios.get('/api/answer_choice_stats');
-            analysisData.answerChoices = answerResponse.data;
-            createAnswerChoiceChart(answerResponse.data);
-            updateAnswerChoiceStats(answerResponse.data);
-            console.log('Answer choice analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading answer choice analysis:', error);
+    },
+    {
+        name: 'joker_stats',
+        label: 'joker analysis',
+        render: function (data) {
+            analysisData.jokers = data;
+            createJokerAnalysisChart(data);
         }
-
-        // Load elimination analysis
-        console.log('Loading elimination analysis...');
-        try {
-            const eliminationResponse = await axios.get('/api/elimination_analysis');
-            analysisData.eliminations = eliminationResponse.data;
-            createEliminationChart(eliminationResponse.data);
-            console.log('Elimination analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading elimination analysis:', error);
+    },
+    {
+        name: 'answer_choice_stats',
+        label: 'answer choice analysis',
+        render: function (data) {
+            analysisData.answerChoices = data;
+            createAnswerChoiceChart(data);
+            updateAnswerChoiceStats(data);
         }
-
-        // Load preparation guide
-        console.log('Loading preparation guide...');
-        try {
-            const preparationResponse = await axios.get('/api/topic_preparation_guide');
-            analysisData.preparation = preparationResponse.data;
-            createPreparationChart(preparationResponse.data);
-            updatePreparationRecommendations(preparationResponse.data);
-            console.log('Preparation guide loaded successfully');
-        } catch (error) {
-            console.error('Error loading preparation guide:', error);
+    },
+    {
+        name: 'elimination_analysis',
+        label: 'elimination analysis',
+        render: function (data) {
+            analysisData.eliminations = data;
+            createEliminationChart(data);
         }
-
-        // Load topic preparation guide
-        console.log('Loading topic preparation guide...');
-        try {
-            const topicResponse = await axios.get('/api/topic_preparation_guide');
-            analysisData.topics = topicResponse.data;
-            createTopicPreparationGuide(topicResponse.data);
-            console.log('Topic preparation guide loaded successfully');
-        } catch (error) {
-            console.error('Error loading topic preparation guide:', error);
+    },
+    {
+        name: 'topic_preparation_guide',
+        label: 'preparation guide',
+        render: function (data) {
+            analysisData.preparation = data;
+            analysisData.topics = data;
+            createPreparationChart(data);
+            updatePreparationRecommendations(data);
+        }
+    },
+    {
+        name: 'detailed_answer_analysis',
+        label: 'detailed answer analysis',
+        render: function (data) {
+            analysisData.detailedAnswers = data;
+            displayDetailedAnswerAnalysis(data);
         }
+    }
+];
 
-        // Load detailed answer analysis
-        console.log('Loading detailed answer analysis...');
-        try {
-            const detailedAnswerResponse = await axios.get('/api/detailed_answer_analysis');
-            analysisData.detailedAnswers = detailedAnswerResponse.data;
-            displayDetailedAnswerAnalysis(detailedAnswerResponse.data);
-            console.log('Detailed answer analysis loaded successfully');
-        } catch (error) {
-            console.error('Error loading detailed answer analysis:', error);
+// Render one dashboard section without letting its errors stop the others
+function renderDashboardSection(section, data) {
+    try {
+        section.render(data);
+        console.log(`Loaded ${section.label} successfully`);
+    } catch (error) {
+        console.error(`Error loading ${section.label}:`, error);
+    }
+}
+
+// How the dashboard loads its data: 'batched' (one /api/dashboard request) or
+// 'parallel' (every section endpoint at once). Override with ?load=parallel
+const DASHBOARD_LOAD_MODE = new URLSearchParams(window.location.search).get('load') || 'batched';
+
+// Load all analytical data from API
+async function loadAnalyticalData(mode = DASHBOARD_LOAD_MODE) {
+    try {
+        showLoading();
+
+        console.log(`Starting to load analytical data (${mode} mode)...`);
+
+        if (mode === 'parallel') {
+            await loadSectionsInParallel();
+        } else {
+            try {
+                await loadSectionsBatched();
+            } catch (error) {
+                console.warn('Batched dashboard request failed, loading sections in parallel:', error);
+                await loadSectionsInParallel();
+            }
         }
 
         hideLoading();
@@ -150,6 +149,38 @@ async function loadAnalyticalData() {
     }
 }
 
+// One request returns every section computed from the same dataset version
+async function loadSectionsBatched() {
+    const dashboardResponse = await axios.get('/api/dashboard');
+    dashboardSections.forEach(section => {
+        renderDashboardSection(section, dashboardResponse.data[section.name]);
+    });
+}
+
+// Request every endpoint concurrently and render each section as its data arrives
+async function loadSectionsInParallel() {
+    // Sections sharing an endpoint reuse a single request
+    const endpoints = [...new Set(dashboardSections.map(section => section.name))];
+
+    const loaded = await Promise.all(endpoints.map(name =>
+        axios.get(`/api/${name}`)
+            .then(response => {
+                dashboardSections
+                    .filter(section => section.name === name)
+                    .forEach(section => renderDashboardSection(section, response.data));
+                return true;
+            })
+            .catch(error => {
+                console.error(`Error loading /api/${name}:`, error);
+                return false;
+            })
+    ));
+
+    if (!loaded.some(Boolean)) {
+        throw new Error('No dashboard endpoint could be loaded');
+    }
+}
+
 // Update stats cards
 function updateStatsCards(stats) {
     document.getElementById('total-questions').textContent = stats.total_questions.toLocaleString();
@@ -1040,6 +1071,16 @@ function displayStrategicInsights(insights) {
 }
 
 // Pattern Analysis Functions
+
+// Report sections the pattern analysis view renders; the rest are not computed
+const PATTERN_ANALYSIS_SECTIONS = [
+    'summary_statistics',
+    'performance_clusters',
+    'transition_matrices',
+    'first_choice_patterns',
+    'deep_sequential_patterns',
+];
+
 async function loadPatternAnalysis() {
     const statusDiv = document.getElementById('patternAnalysisStatus');
     const resultsDiv = document.getElementById('patternAnalysisResults');
@@ -1049,7 +1090,9 @@ async function loadPatternAnalysis() {
         loadButton.disabled = true;
         statusDiv.innerHTML = '<div class="status-loading">🔄 Loading comprehensive pattern analysis...</div>';
 
-        const response = await axios.get('/api/pattern_analysis');
+        const response = await axios.get('/api/pattern_analysis', {
+            params: { sections: PATTERN_ANALYSIS_SECTIONS.join(',') }
+        });
         const data = response.data;
 
         // Display transition matrix
@@ -1078,11 +1121,26 @@ async function loadPatternAnalysis() {
     }
 }
 
-function displayTransitionMatrix(transitionData) {
+function displayTransitionMatrix(matrix) {
     const container = document.getElementById('transitionMatrix');
     container.innerHTML = '';
 
-    for (const [fromChoice, transitions] of Object.entries(transitionData)) {
+    // Sparse rows: cells[i] is [column, count, column, count, ...] for rows[i]
+    matrix.rows.forEach((fromChoice, i) => {
+        const transitions = [];
+        for (let k = 0; k < matrix.cells[i].length; k += 2) {
+            transitions.push([matrix.columns[matrix.cells[i][k]], matrix.cells[i][k + 1]]);
+        }
+
+        // Sort transitions by count
+        const sortedTransitions = transitions
+            .sort(([, a], [, b]) => b - a)
+            .slice(0, 5); // Show top 5 transitions
+
+        if (sortedTransitions.length === 0) {
+            return;
+        }
+
         const matrixRow = document.createElement('div');
         matrixRow.className = 'matrix-row';
 
@@ -1093,11 +1151,6 @@ function displayTransitionMatrix(transitionData) {
         const transitionsDiv = document.createElement('div');
         transitionsDiv.className = 'matrix-transitions';
 
-        // Sort transitions by count
-        const sortedTransitions = Object.entries(transitions)
-            .sort(([, a], [, b]) => b - a)
-            .slice(0, 5); // Show top 5 transitions
-
         sortedTransitions.forEach(([toChoice, count]) => {
             const transitionItem = document.createElement('div');
             transitionItem.className = 'transition-item';
@@ -1108,7 +1161,7 @@ function displayTransitionMatrix(transitionData) {
         matrixRow.appendChild(fromDiv);
         matrixRow.appendChild(transitionsDiv);
         container.appendChild(matrixRow);
-    }
+    });
 }
 
 function displaySequentialPatterns(patternsData) {
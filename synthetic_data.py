@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic Milyoner-shaped datasets for benchmarking
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+
+CHOICES = np.array(["A", "B", "C", "D"], dtype=object)
+
+# Probability of answering correctly at each level (1-15), close to the real data
+LEVEL_ACCURACY = np.array(
+    [
+        0.99,
+        0.99,
+        0.98,
+        0.94,
+        0.94,
+        0.82,
+        0.68,
+        0.69,
+        0.47,
+        0.39,
+        0.26,
+        0.2,
+        0.2,
+        0.2,
+        0.2,
+    ]
+)
+
+# Chance that a contestant walks away instead of answering the next question
+WITHDRAW_RATE = 0.03
+
+LEVEL_AMOUNTS = np.array(
+    [
+        1000,
+        2000,
+        3000,
+        5000,
+        7500,
+        15000,
+        30000,
+        50000,
+        100000,
+        200000,
+        300000,
+        500000,
+        1000000,
+        2000000,
+        5000000,
+    ],
+    dtype=float,
+)
+
+CATEGORIES = np.array(
+    [
+        "Genel Kültür",
+        "Müzik",
+        "Edebiyat",
+        "Bilim",
+        "Coğrafya",
+        "Spor",
+        "Tarih",
+        "Sanat",
+        "Matematik",
+        "Teknoloji",
+    ],
+    dtype=object,
+)
+CATEGORY_WEIGHTS = np.array(
+    [0.41, 0.12, 0.09, 0.08, 0.07, 0.07, 0.06, 0.06, 0.03, 0.01]
+)
+
+JOKERS = np.array(
+    ["yok", "seyirci", "telefon", "yarı_yarıya", "çift_cevap", "değiştir"], dtype=object
+)
+JOKER_WEIGHTS = np.array([0.69, 0.10, 0.08, 0.07, 0.04, 0.02])
+
+# Share of questions where the contestant answer could not be extracted
+MISSING_ANSWER_RATE = 0.035
+
+COLUMNS = [
+    "video_id",
+    "contestant",
+    "question",
+    "options",
+    "correct_answer",
+    "contestant_answer",
+    "category",
+    "level",
+    "amount",
+    "joker_used",
+    "is_correct",
+    "eliminated",
+]
+
+
+def generate_dataset(rows, seed=0, contestants_per_video=6):
+    """Build a DataFrame with the same columns as milyoner_data.csv"""
+    rng = np.random.default_rng(seed)
+
+    # Simulate whole games until at least ``rows`` questions were asked
+    contestants = max(1, int(rows / 6) + 1)
+    while True:
+        answers_correct = (
+            rng.random((contestants, len(LEVEL_ACCURACY))) < LEVEL_ACCURACY
+        )
+        withdraws = rng.random((contestants, len(LEVEL_ACCURACY))) < WITHDRAW_RATE
+        withdraws[:, 0] = False
+
+        # A game stops at the first wrong answer or when the contestant withdraws
+        first_wrong = np.where(
+            (~answers_correct).any(axis=1),
+            (~answers_correct).argmax(axis=1),
+            len(LEVEL_ACCURACY),
+        )
+        first_withdraw = np.where(
+            withdraws.any(axis=1), withdraws.argmax(axis=1), len(LEVEL_ACCURACY)
+        )
+        eliminated = first_wrong < first_withdraw
+        lengths = np.where(eliminated, first_wrong + 1, first_withdraw)
+
+        if lengths.sum() >= rows:
+            break
+        contestants *= 2
+
+    # Trim to the requested size on a contestant boundary
+    keep = int(np.searchsorted(np.cumsum(lengths), rows)) + 1
+    lengths, eliminated = lengths[:keep], eliminated[:keep]
+
+    contestant_ids = np.repeat(np.arange(keep), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    levels = np.arange(len(contestant_ids)) - starts + 1
+    last_question = levels == lengths[contestant_ids]
+    is_correct = ~(last_question & eliminated[contestant_ids])
+    total = len(contestant_ids)
+
+    correct_answer = CHOICES[rng.integers(0, 4, total)]
+    wrong_offset = rng.integers(1, 4, total)
+    wrong_answer = CHOICES[
+        (np.searchsorted(CHOICES, correct_answer) + wrong_offset) % 4
+    ]
+    contestant_answer = np.where(is_correct, correct_answer, wrong_answer)
+    contestant_answer[rng.random(total) < MISSING_ANSWER_RATE] = np.nan
+
+    video_ids = contestant_ids // contestants_per_video
+    question_ids = np.arange(total)
+
+    df = pd.DataFrame(
+        {
+            "video_id": pd.Series(video_ids).map("video_{:05d}".format),
+            "contestant": pd.Series(contestant_ids).map("Contestant_{:06d}".format),
+            "question": pd.Series(question_ids).map("Question {}".format),
+            "options": "['A ...', 'B ...', 'C ...', 'D ...']",
+            "correct_answer": correct_answer,
+            "contestant_answer": contestant_answer,
+            "category": rng.choice(CATEGORIES, total, p=CATEGORY_WEIGHTS),
+            "level": levels,
+            "amount": LEVEL_AMOUNTS[levels - 1],
+            "joker_used": rng.choice(JOKERS, total, p=JOKER_WEIGHTS),
+            "is_correct": is_correct,
+            "eliminated": last_question & eliminated[contestant_ids],
+        }
+    )
+    return df[COLUMNS]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", type=int, help="approximate number of questions")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = generate_dataset(args.rows, seed=args.seed)
+    df.to_csv(args.output, index=False)
+    print(f"Synthetic dataset saved to {args.output}: {len(df)} rows")
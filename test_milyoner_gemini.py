@@ -0,0 +1,351 @@
+"""
+Offline tests of the transcript pipeline in milyoner_gemini.py
+
+Run with ``python -m pytest -q test_milyoner_gemini.py``. Nothing here
+calls YouTube or Gemini; the pipeline's own third-party imports must still
+be installed.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+pytest.importorskip("google.genai")
+pytest.importorskip("youtube_transcript_api")
+pytest.importorskip("dotenv")
+
+import milyoner_gemini as M  # noqa: E402
+
+
+def game_transcript(contestants, questions):
+    """Host patter for ``contestants`` each playing ``questions`` questions"""
+    parts = []
+    for name in contestants:
+        parts.append(f"Yarışmacımız {name} hoş bir akşam diliyoruz")
+        for level in range(1, questions + 1):
+            parts.append(
+                f"{level}. soru geliyor Q-{name}-{level} nedir "
+                + "bla " * 40
+                + "cevap A doğru"
+            )
+    return " ".join(parts)
+
+
+def test_every_chunk_names_the_contestant_of_its_questions():
+    contestants = ["Ayşe", "Mehmet", "Zeynep", "Ali"]
+    text = game_transcript(contestants, 12)
+    chunks = M.chunk_transcript(text, max_chars=2500, overlap=300)
+    assert len(chunks) > len(contestants)
+
+    found = set()
+    for chunk in chunks:
+        assert len(chunk) <= 2500
+        assert M.CONTESTANT_BOUNDARY.search(chunk), chunk[:80]
+        for match in re.finditer(r"Q-(\w+)-(\d+)", chunk):
+            # The nearest introduction before a question is its contestant's
+            intros = re.findall(r"Yarışmacımız (\w+)", chunk[: match.start()])
+            assert intros and intros[-1] == match.group(1)
+            found.add((match.group(1), int(match.group(2))))
+
+    assert found == {(name, level) for name in contestants for level in range(1, 13)}
+
+
+def test_chunks_without_boundaries_overlap():
+    text = " ".join(f"kelime{i}" for i in range(2000))
+    chunks = M.chunk_transcript(text, max_chars=3000, overlap=400)
+    assert len(chunks) > 1
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.split()[0] in previous.split()
+    assert chunks[-1].split()[-1] == "kelime1999"
+
+
+def test_short_transcript_is_one_chunk():
+    assert M.chunk_transcript("kısa metin") == ["kısa metin"]
+
+
+def question(contestant, text, level, answer="A"):
+    return {
+        "contestant": contestant,
+        "question": text,
+        "level": level,
+        "contestant_answer": answer,
+    }
+
+
+def test_merge_keeps_the_complete_copy_of_an_overlapping_question():
+    # The first chunk ends inside level 5; the next one holds all of it
+    first = [
+        question("Ayşe", "Başkent neresidir?", 4),
+        question("Ayşe", "Türkiye'nin en uzun", 5, answer=""),
+    ]
+    second = [
+        question("ayşe ", "Türkiye'nin en uzun nehri hangisidir?", 5),
+        question("Ayşe", "Hangi gezegen kırmızıdır?", 6),
+    ]
+    merged = M.merge_chunk_outputs([json.dumps(first), json.dumps(second)])
+    assert [entry["question"] for entry in merged] == [
+        "Başkent neresidir?",
+        "Türkiye'nin en uzun nehri hangisidir?",
+        "Hangi gezegen kırmızıdır?",
+    ]
+
+    # A partial copy arriving after the complete one does not replace it
+    merged = M.merge_chunk_outputs([json.dumps(second), json.dumps(first)])
+    assert merged[0]["question"] == "Türkiye'nin en uzun nehri hangisidir?"
+
+
+def test_merge_drops_questions_repeated_at_a_boundary():
+    first = [
+        {
+            "contestant": "Ali",
+            "questions_answered": [
+                {"question": "Soru bir", "level": 1, "contestant_answer": "B"},
+                {"question": "Soru iki", "level": 2, "contestant_answer": "C"},
+            ],
+        }
+    ]
+    second = [
+        {
+            "contestant": "Ali",
+            "questions_answered": [
+                {"question": "soru  iki", "level": 0, "contestant_answer": "C"},
+                {"question": "Soru üç", "level": 3, "contestant_answer": "D"},
+            ],
+        },
+        question("Veli", "Soru bir", 1),
+    ]
+    merged = M.merge_chunk_outputs([json.dumps(first), json.dumps(second)])
+    assert [
+        [q["question"] for q in entry["questions_answered"]]
+        for entry in merged
+        if "questions_answered" in entry
+    ] == [["Soru bir", "Soru iki"], ["Soru üç"]]
+    # The same question for another contestant is not a repeat
+    assert merged[-1] == question("Veli", "Soru bir", 1)
+
+
+class Reply:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubLLM:
+    """Stands in for genai.Client, replying with ``replies`` in turn"""
+
+    def __init__(self, *replies):
+        self.models = self
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate_content(self, model, contents):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return Reply(reply)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in ``tmp_path`` with fresh caches and no rate limits"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(M, "response_cache", M.ResponseCache("llm_cache", 10**9))
+    monkeypatch.setattr(M, "journal", M.JobJournal("jobs"))
+    for service in (M.transcript_service, M.llm_service):
+        monkeypatch.setattr(service.bucket, "rate", 0)
+    return tmp_path
+
+
+def test_unparseable_replies_are_not_cached(workdir):
+    good = json.dumps([question("Ayşe", "Başkent neresidir?", 4)])
+    llm = StubLLM('[{"contestant": "Ay', "", good)
+
+    assert M.parse_chunk("parça", llm) == '[{"contestant": "Ay'
+    assert M.parse_chunk("parça", llm) == ""
+    assert M.parse_chunk("parça", llm) == good
+    assert M.parse_chunk("parça", llm) == good
+    assert llm.calls == 3
+
+
+class Clock:
+    """Stands in for the time module in milyoner_gemini; sleeping is instant"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    @staticmethod
+    def strftime(fmt):
+        return time.strftime(fmt)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(M, "time", clock)
+    # Full jitter always picks the longest backoff
+    monkeypatch.setattr(M.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(M, "BACKOFF_BASE_SECONDS", 1.0)
+    monkeypatch.setattr(M, "BACKOFF_MAX_SECONDS", 60.0)
+    return clock
+
+
+def http_error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def flaky(*outcomes):
+    """Function raising or returning ``outcomes`` in turn, counting its calls"""
+    outcomes = list(outcomes)
+
+    def call():
+        call.calls += 1
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    call.calls = 0
+    return call
+
+
+def test_retry_after_is_honoured_up_to_the_backoff_cap(clock):
+    client = M.ServiceClient("test", 0, timeout=5)
+    fn = flaky(http_error(429, "2.5"), http_error(429, "86400"), "ok")
+
+    assert client.call(fn) == "ok"
+    assert fn.calls == 3
+    # max(full jitter backoff, Retry-After), the header capped at 60s
+    assert clock.sleeps == [2.5, 60.0]
+
+
+def test_client_errors_are_not_retried(clock):
+    client = M.ServiceClient("test", 0, timeout=5)
+    fn = flaky(http_error(400), "ok")
+
+    with pytest.raises(requests.HTTPError):
+        client.call(fn)
+    assert fn.calls == 1
+    assert clock.sleeps == []
+
+
+def test_breaker_pauses_calls_after_repeated_failures(clock):
+    client = M.ServiceClient("test", 0, timeout=5)
+    client.breaker = M.CircuitBreaker("test", threshold=2, cooldown=30)
+    fn = flaky(http_error(503), http_error(503), "ok")
+
+    assert client.call(fn) == "ok"
+    # Backoffs of 2s and 4s; the second failure at t=2 opened the circuit
+    # until t=32, so the third attempt waits out the remaining 26s
+    assert clock.sleeps == [2.0, 4.0, 26.0]
+
+    # A success closes it again
+    assert client.call(flaky("again")) == "again"
+    assert clock.sleeps == [2.0, 4.0, 26.0]
+
+
+def test_watchdog_abandons_hung_calls_up_to_a_limit(monkeypatch):
+    monkeypatch.setattr(M, "ABANDONED_CALLS_MAX", 2)
+    client = M.ServiceClient("test", 0, timeout=0.05, attempts=1, watchdog=True)
+    release = threading.Event()
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            client.call(release.wait)
+    # Two hung threads are still running, so no third one is started
+    with pytest.raises(RuntimeError):
+        client.call(lambda: "ok")
+
+    release.set()
+    for thread in client._abandoned:
+        thread.join()
+    assert client.call(lambda: "ok") == "ok"
+
+
+class EpisodeLLM:
+    """Stands in for genai.Client, extracting three questions per video"""
+
+    def __init__(self, failing=()):
+        self.models = self
+        self.failing = set(failing)
+        self.calls = 0
+
+    def generate_content(self, model, contents):
+        self.calls += 1
+        vid = re.search(r"VIDEO=(\w+)", contents).group(1)
+        if vid in self.failing:
+            raise ValueError(f"model failed on {vid}")
+        return Reply(
+            json.dumps(
+                [
+                    {
+                        **question(f"Ali {vid}", f"Soru {level} {vid}", level),
+                        "correct_answer": "A",
+                        "is_correct": True,
+                        "eliminated": False,
+                    }
+                    for level in range(1, 4)
+                ]
+            )
+        )
+
+
+def test_resume_redoes_only_unfinished_videos(workdir, monkeypatch):
+    urls = [f"https://www.youtube.com/watch?v=vid{i}" for i in range(4)]
+    fetched = []
+
+    def fetch(vid):
+        fetched.append(vid)
+        return f"Yarışmacımız Ali VIDEO={vid} 1. soru geliyor"
+
+    M.main(urls, 2, EpisodeLLM(failing={"vid1", "vid3"}), fetch)
+    assert {vid: M.journal.get(vid)["stage"] for vid in ["vid0", "vid1"]} == {
+        "vid0": "written",
+        "vid1": "fetched",
+    }
+
+    # A cold response cache, so every model call resume makes is counted
+    monkeypatch.setattr(M, "response_cache", M.ResponseCache("cold", 10**9))
+    fetched.clear()
+    llm = EpisodeLLM()
+    M.resume(2, llm, fetch)
+    assert llm.calls == 2
+    assert fetched == []
+    combined = pd.read_csv("csv/milyoner_data_all.csv")
+    assert sorted(combined["video_id"].unique()) == ["vid0", "vid1", "vid2", "vid3"]
+
+    # Nothing is left to redo
+    llm = EpisodeLLM()
+    M.resume(2, llm, fetch)
+    assert llm.calls == 0
+
+    # A deleted video CSV is written again without asking the model
+    os.remove("csv/vid2.csv")
+    M.resume(2, llm, fetch)
+    assert llm.calls == 0
+    assert os.path.exists("csv/vid2.csv")
+
+
+def test_resume_without_a_run(workdir, capsys):
+    M.resume(1, EpisodeLLM(), lambda vid: "")
+    assert "No run recorded" in capsys.readouterr().out
@@ -0,0 +1,143 @@
+"""
+Parity of the aggregate-based category and level stats with the old loops
+
+Run with ``python -m pytest -q test_stats_parity.py``. The reference
+functions are the filtering loops the endpoints used before they were
+rebuilt on AggregateStore crosstabs; payloads must serialize identically.
+"""
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from aggregates import AggregateStore
+from app import DATA_PATH, category_stats_payload, level_stats_payload
+from synthetic_data import generate_dataset
+
+
+def reference_category_stats(df):
+    """The per-(category, level) filtering loop /api/category_stats used to run"""
+
+    # Detailed category analysis
+    category_stats = []
+    for category in df["category"].unique():
+        cat_data = df[df["category"] == category]
+
+        # Level distribution for this category
+        level_distribution = {}
+        for level in range(1, 16):
+            level_questions = cat_data[cat_data["level"] == level]
+            level_distribution[f"level_{level}"] = int(len(level_questions))
+
+        # Before level 7 vs after level 7
+        before_level_7 = cat_data[cat_data["level"] < 7]
+        level_7_and_after = cat_data[cat_data["level"] >= 7]
+
+        category_stats.append(
+            {
+                "category": str(category),
+                "total_questions": int(len(cat_data)),
+                "accuracy": float((cat_data["is_correct"].sum() / len(cat_data)) * 100),
+                "average_level": float(cat_data["level"].mean()),
+                "before_level_7": int(len(before_level_7)),
+                "level_7_and_after": int(len(level_7_and_after)),
+                "before_level_7_accuracy": (
+                    float(
+                        (before_level_7["is_correct"].sum() / len(before_level_7)) * 100
+                    )
+                    if len(before_level_7) > 0
+                    else 0
+                ),
+                "level_7_and_after_accuracy": (
+                    float(
+                        (level_7_and_after["is_correct"].sum() / len(level_7_and_after))
+                        * 100
+                    )
+                    if len(level_7_and_after) > 0
+                    else 0
+                ),
+                "level_distribution": level_distribution,
+            }
+        )
+
+    return category_stats
+
+
+def reference_level_stats(df):
+    """The per-level filtering loop /api/level_stats used to run"""
+
+    # Detailed level analysis
+    level_stats = []
+    for level in sorted(df["level"].unique()):
+        level_data = df[df["level"] == level]
+
+        # Category distribution for this level
+        category_distribution = {}
+        for category in df["category"].unique():
+            cat_questions = level_data[level_data["category"] == category]
+            category_distribution[category] = int(len(cat_questions))
+
+        # Elimination analysis
+        eliminated_at_level = level_data[level_data["eliminated"] == True]
+
+        level_stats.append(
+            {
+                "level": int(level),
+                "total_questions": int(len(level_data)),
+                "accuracy": float(
+                    (level_data["is_correct"].sum() / len(level_data)) * 100
+                ),
+                "amount": float(
+                    level_data["amount"].iloc[0] if len(level_data) > 0 else 0
+                ),
+                "eliminated_count": int(len(eliminated_at_level)),
+                "elimination_rate": (
+                    float((len(eliminated_at_level) / len(level_data)) * 100)
+                    if len(level_data) > 0
+                    else 0
+                ),
+                "category_distribution": category_distribution,
+                "most_common_category": (
+                    max(category_distribution.items(), key=lambda x: x[1])[0]
+                    if category_distribution
+                    else None
+                ),
+            }
+        )
+
+    return level_stats
+
+
+def serialized(payload):
+    # Same key order and float formatting as jsonify
+    return json.dumps(payload, sort_keys=True)
+
+
+def datasets():
+    yield "synthetic-3k", lambda: generate_dataset(3_000, seed=0)
+    yield "synthetic-50k", lambda: generate_dataset(50_000, seed=1)
+    for path in (DATA_PATH, "milyoner_data.csv"):
+        if os.path.exists(path):
+            yield path, lambda path=path: pd.read_csv(path)
+
+
+@pytest.fixture(scope="module", params=list(datasets()), ids=lambda item: item[0])
+def dataset(request):
+    df = request.param[1]()
+    return df, AggregateStore(df)
+
+
+def test_category_stats_match_reference(dataset):
+    df, store = dataset
+    assert serialized(category_stats_payload(store)) == serialized(
+        reference_category_stats(df)
+    )
+
+
+def test_level_stats_match_reference(dataset):
+    df, store = dataset
+    assert serialized(level_stats_payload(store)) == serialized(
+        reference_level_stats(df)
+    )